@@ -1,171 +1,47 @@
 # app_bst_streamlit_sem_tabs.py
 
 import streamlit as st
-import time
-import re
-from graphviz import Digraph
-from collections import deque
-
-# ─────────────────────────────────────────────────────────────────────────── #
-#                           Definição do nó da BST
-# ─────────────────────────────────────────────────────────────────────────── #
-class Node:
-    def __init__(self, key: int):
-        self.key = key
-        self.left: "Node | None" = None
-        self.right: "Node | None" = None
-
-# ─────────────────────────────────────────────────────────────────────────── #
-#              Função tradicional para inserir na BST (in-order de antes)
-# ─────────────────────────────────────────────────────────────────────────── #
-def bst_insert(root: Node | None, key: int) -> Node:
-    if root is None:
-        return Node(key)
-    if key < root.key:
-        root.left = bst_insert(root.left, key)
-    elif key > root.key:
-        root.right = bst_insert(root.right, key)
-    # se igual, não insere (evita duplicados)
-    return root
-
-# ─────────────────────────────────────────────────────────────────────────── #
-#            Funções geradoras dos quatro tipos de percurso (in-order etc)
-# ─────────────────────────────────────────────────────────────────────────── #
-def preorder_keys(root: Node | None):
-    if root is None:
-        return
-    yield root.key
-    yield from preorder_keys(root.left)
-    yield from preorder_keys(root.right)
-
-def inorder_keys(root: Node | None):
-    if root is None:
-        return
-    yield from inorder_keys(root.left)
-    yield root.key
-    yield from inorder_keys(root.right)
-
-def postorder_keys(root: Node | None):
-    if root is None:
-        return
-    yield from postorder_keys(root.left)
-    yield from postorder_keys(root.right)
-    yield root.key
-
-def breadth_first_keys(root: Node | None):
-    if root is None:
-        return
-    queue = deque([root])
-    while queue:
-        node = queue.popleft()
-        yield node.key
-        if node.left:
-            queue.append(node.left)
-        if node.right:
-            queue.append(node.right)
-
-# ─────────────────────────────────────────────────────────────────────────── #
-#      Função para transformar texto DOT (Graphviz) em estrutura de BST
-# ─────────────────────────────────────────────────────────────────────────── #
-def parse_dot_to_bst(dot_text: str) -> Node | None:
-    """
-    Recebe o texto DOT (Graphviz) e constrói os nós com as arestas "esq" e "dir".
-    Retorna a raiz da BST encontrada (nó cuja chave não aparece como filho).
-    """
-    # 1) Extrair todos os IDs numéricos definidos como nós: node<numero>[...]
-    node_defs = re.findall(r'\bnode(\d+)\s*\[', dot_text)
-    all_keys = set(int(k) for k in node_defs)
-
-    # 2) Criar instâncias Node para cada chave
-    nodes: dict[int, Node] = {k: Node(k) for k in all_keys}
-
-    # 3) Encontrar todas as linhas de aresta no padrão:
-    #    "node5":esq -> "node4"   ou   node5:esq->node4
-    edge_pattern = re.compile(r'"?node(\d+)"?\s*:(\w+)\s*->\s*"?node(\d+)"?')
-    child_keys = set()
-
-    for match in edge_pattern.finditer(dot_text):
-        parent_key = int(match.group(1))
-        port_name = match.group(2).lower()
-        child_key = int(match.group(3))
-
-        if parent_key not in nodes or child_key not in nodes:
-            continue
-
-        parent_node = nodes[parent_key]
-        child_node = nodes[child_key]
-
-        if port_name == "esq":
-            parent_node.left = child_node
-        elif port_name == "dir":
-            parent_node.right = child_node
-
-        child_keys.add(child_key)
-
-    # 4) Identificar raiz: chave que não aparece em child_keys
-    root_candidates = [k for k in all_keys if k not in child_keys]
-    if not root_candidates:
-        return None
-    root_key = root_candidates[0]
-    return nodes[root_key]
-
-# ─────────────────────────────────────────────────────────────────────────── #
-#       Função que percorre a árvore buscando uma chave e retorna:
-#       1) o nó encontrado (ou None)
-#       2) a lista de chaves visitadas, em ordem
-# ─────────────────────────────────────────────────────────────────────────── #
-def search_node_ref(root: Node | None, key: int) -> tuple[Node | None, list[int]]:
-    """
-    Percorre a BST iterativamente, acumulando cada nó visitado em uma lista.
-    Se encontrar 'key', retorna (nó_encontrado, caminho_lista). Caso contrário,
-    retorna (None, caminho_lista) após esgotar a busca.
-    """
-    visited_list: list[int] = []
-    current = root
-    while current is not None:
-        visited_list.append(current.key)
-        if key == current.key:
-            return current, visited_list
-        elif key < current.key:
-            current = current.left
-        else:  # key > current.key
-            current = current.right
-    return None, visited_list
-
-# ─────────────────────────────────────────────────────────────────────────── #
-#   Função para construir o grafo Graphviz colorindo nós visitados e,
-#   opcionalmente, o nó encontrado em outra cor (por ex. lightgreen).
-# ─────────────────────────────────────────────────────────────────────────── #
-def build_dot(root: Node | None, visited_set: set[int], found_key: int | None = None) -> Digraph:
-    """
-    - visited_set: conjunto de chaves de nós que já foram visitados (coloridos de lightblue)
-    - found_key: se não for None, o nó com chave == found_key será colorido de lightgreen.
-    """
-    dot = Digraph(format="png")
-    dot.attr("node", shape="circle", style="filled", color="black")
-
-    def add_nodes_edges(node: Node | None):
-        if node is None:
-            return
-
-        if found_key is not None and node.key == found_key:
-            fill = "lightgreen"
-        elif node.key in visited_set:
-            fill = "lightblue"
-        else:
-            fill = "white"
-
-        dot.node(str(node.key), fillcolor=fill)
-
-        if node.left:
-            dot.edge(str(node.key), str(node.left.key))
-            add_nodes_edges(node.left)
-        if node.right:
-            dot.edge(str(node.key), str(node.right.key))
-            add_nodes_edges(node.right)
-
-    add_nodes_edges(root)
-    return dot
+import io
+import os
+from itertools import islice
+
+# Motor da árvore (sem interface) no pacote bst, ao lado deste script
+from bst import (
+    BALANCE_AVL,
+    BALANCE_MODES,
+    BALANCE_NONE,
+    LOD_AUTO_NODES,
+    METRICS,
+    ArrayTree,
+    DotParseError,
+    EytzingerTree,
+    SnapshotError,
+    TreeCache,
+    breadth_first_keys,
+    bst_build,
+    bst_delete,
+    bst_insert,
+    build_dot,
+    build_dot_lod,
+    ceiling,
+    count_range,
+    floor,
+    inorder_keys,
+    parse_dot_stream,
+    postorder_keys,
+    predecessor,
+    preorder_keys,
+    range_keys,
+    rank,
+    search_many,
+    search_node_ref,
+    select,
+    snapshot_from_buffer,
+    step_style,
+    successor,
+    tree_layout_svg,
+    write_snapshot,
+)
 
 # ─────────────────────────────────────────────────────────────────────────── #
 #                         Inicialização do Streamlit
@@ -173,11 +49,24 @@ def build_dot(root: Node | None, visited_set: set[int], found_key: int | None =
 st.set_page_config(layout="centered")
 st.title("📊 Árvore Binária de Busca")
 
+# Uma única instância por processo (sobrevive aos reruns e é vista por todas as sessões)
+@st.cache_resource
+def shared_tree_cache() -> TreeCache:
+    return TreeCache()
+
+arvores = shared_tree_cache()
+
 # ─────────────────────────────────────────────────────────────────────────── #
 #               Inicializa chaves em session_state, se não existirem
 # ─────────────────────────────────────────────────────────────────────────── #
 if "root" not in st.session_state:
     st.session_state["root"] = None
+# tree_version: incrementado a cada nova árvore (invalida o snapshot preparado)
+if "tree_version" not in st.session_state:
+    st.session_state["tree_version"] = 0
+# lod_expanded: chaves cujas subárvores o usuário abriu na visão resumida
+if "lod_expanded" not in st.session_state:
+    st.session_state["lod_expanded"] = set()
 
 # Estado geral da aplicação:
 # - operation: "idle" | "search" | "traversal"
@@ -205,6 +94,25 @@ if st.session_state["target_key"] is None:
 #                         SIDEBAR: Construção da Árvore
 # ─────────────────────────────────────────────────────────────────────────── #
 st.sidebar.write("# 1) Construir Árvore")
+# Formas de guardar a árvore construída (as duas últimas são somente leitura)
+armazenamentos = {
+    "node": ("Objetos Node (editável)", lambda root: root),
+    "compacto": ("Compacto em colunas (ArrayTree)", lambda root: ArrayTree.from_root(root).root),
+    "eytzinger": ("Congelado em ordem BFS (Eytzinger)", lambda root: EytzingerTree.from_root(root).root),
+}
+sel_armazenamento = st.sidebar.selectbox(
+    "💾 Armazenamento:",
+    list(armazenamentos),
+    format_func=lambda modo: armazenamentos[modo][0],
+    help=(
+        "Compacto: colunas tipadas em vez de objetos Node. "
+        "Eytzinger: um único array em ordem de largura, mais rápido para buscas; "
+        "a árvore vira a árvore completa com as mesmas chaves."
+    ),
+)
+converter_armazenamento = armazenamentos[sel_armazenamento][1]
+# As colunas dos armazenamentos somente leitura são int64 (array "q")
+ERRO_INT64 = "❌ Chaves fora do intervalo de 64 bits só cabem no armazenamento em objetos Node."
 
 ## 1.1) Modo Valores
 st.sidebar.subheader("A) A partir de VALORES")
@@ -212,6 +120,17 @@ valores_txt = st.sidebar.text_input(
     "🔢 Valores (ex: 50,30,70,20)",
     value="50,30,70,20,40,60,80,10,25,35,45"
 )
+balance_labels = {BALANCE_NONE: "Nenhum (BST simples)", BALANCE_AVL: "AVL"}
+sel_balance = st.sidebar.selectbox(
+    "⚖️ Balanceamento:",
+    BALANCE_MODES,
+    format_func=lambda mode: balance_labels[mode],
+)
+manter_forma = st.sidebar.checkbox(
+    "Manter a forma da inserção sequencial",
+    value=True,
+    help="Desmarcado: ordena as chaves e monta direto a árvore perfeitamente balanceada.",
+)
 if st.sidebar.button("🛠️ Construir (Valores)"):
     try:
         lista_valores = [int(x.strip()) for x in valores_txt.split(",") if x.strip() != ""]
@@ -221,10 +140,19 @@ if st.sidebar.button("🛠️ Construir (Valores)"):
     if not lista_valores:
         st.sidebar.error("❌ A lista não pode ficar vazia.")
         st.stop()
-    root = None
-    for v in lista_valores:
-        root = bst_insert(root, v)
-    st.session_state["root"] = root
+    chave_arvore = TreeCache.key_for("valores", lista_valores, sel_balance, manter_forma, sel_armazenamento)
+
+    def construir_valores():
+        with METRICS.timer("build.values"):
+            root = bst_build(lista_valores, sel_balance, insertion_shape=manter_forma)
+        return converter_armazenamento(root)
+
+    try:
+        st.session_state["root"] = arvores.get_or_build(chave_arvore, construir_valores)
+    except OverflowError:
+        st.sidebar.error(ERRO_INT64)
+        st.stop()
+    st.session_state["tree_version"] += 1
     # Ao reconstruir a árvore, resetar qualquer operação em curso
     st.session_state["operation"] = "idle"
     st.session_state["sequence"] = []
@@ -258,15 +186,28 @@ dot_default = """digraph g {
   "node15":dir -> "node25" 
 }"""
 dot_text = st.sidebar.text_area("📄 Cole o grafo DOT aqui:", value=dot_default, height=200)
+dot_file = st.sidebar.file_uploader("📂 ...ou envie um arquivo .dot (lido linha a linha):", type=["dot", "gv", "txt"])
 if st.sidebar.button("🛠️ Construir (DOT)"):
-    if not dot_text.strip():
+    if dot_file is None and not dot_text.strip():
         st.sidebar.error("❌ O texto DOT não pode ficar vazio.")
         st.stop()
-    root_dot = parse_dot_to_bst(dot_text)
-    if root_dot is None:
-        st.sidebar.error("❌ Não foi possível analisar o DOT. Verifique o formato.")
+    dot_bytes = dot_file.getvalue() if dot_file is not None else dot_text.encode("utf-8")
+    chave_arvore = TreeCache.key_for("dot", dot_bytes, sel_armazenamento)
+
+    def construir_dot():
+        with METRICS.timer("build.dot"):
+            root_dot = parse_dot_stream(io.BytesIO(dot_bytes))
+        return converter_armazenamento(root_dot)
+
+    try:
+        st.session_state["root"] = arvores.get_or_build(chave_arvore, construir_dot)
+    except DotParseError as erro:
+        st.sidebar.error(f"❌ Não foi possível analisar o DOT: {erro}")
+        st.stop()
+    except OverflowError:
+        st.sidebar.error(ERRO_INT64)
         st.stop()
-    st.session_state["root"] = root_dot
+    st.session_state["tree_version"] += 1
     # Resetar operações ao reconstruir
     st.session_state["operation"] = "idle"
     st.session_state["sequence"] = []
@@ -277,6 +218,125 @@ if st.sidebar.button("🛠️ Construir (DOT)"):
 
 st.sidebar.markdown("---")
 
+## 1.3) Modo Snapshot binário
+st.sidebar.subheader("C) A partir de SNAPSHOT binário")
+snapshot_file = st.sidebar.file_uploader("📂 Envie um snapshot (.bst):", type=["bst"])
+if st.sidebar.button("🛠️ Carregar (Snapshot)"):
+    if snapshot_file is None:
+        st.sidebar.error("❌ Envie um arquivo de snapshot primeiro.")
+        st.stop()
+    snapshot_bytes = snapshot_file.getvalue()
+    chave_arvore = TreeCache.key_for("snapshot", snapshot_bytes)
+    try:
+        st.session_state["root"] = arvores.get_or_build(
+            chave_arvore, lambda: snapshot_from_buffer(snapshot_bytes).root
+        )
+    except SnapshotError as erro:
+        st.sidebar.error(f"❌ Snapshot inválido: {erro}")
+        st.stop()
+    st.session_state["tree_version"] += 1
+    # Resetar operações ao reconstruir
+    st.session_state["operation"] = "idle"
+    st.session_state["sequence"] = []
+    st.session_state["current_index"] = -1
+    st.session_state["auto_run"] = False
+    st.session_state["target_key"] = None
+    st.sidebar.success("✅ Árvore (Snapshot) carregada!")
+
+# Gerar o snapshot custa O(n): só sob demanda. Os bytes ficam no cache do
+# processo, por raiz; a sessão guarda só a versão para a qual os pediu
+def snapshot_da_arvore(root) -> bytes:
+    def gerar() -> bytes:
+        buffer = io.BytesIO()
+        write_snapshot(root, buffer)
+        return buffer.getvalue()
+    return arvores.derived(root, "snapshot", gerar)
+
+if st.session_state["root"] is not None and st.sidebar.button("📦 Preparar snapshot da árvore atual"):
+    try:
+        snapshot_da_arvore(st.session_state["root"])
+    except SnapshotError as erro:
+        st.sidebar.error(f"❌ Não foi possível gerar o snapshot: {erro}")
+    else:
+        st.session_state["snapshot_version"] = st.session_state["tree_version"]
+if st.session_state.get("snapshot_version") == st.session_state["tree_version"]:
+    st.sidebar.download_button(
+        "💾 Baixar snapshot (.bst)", snapshot_da_arvore(st.session_state["root"]), file_name="arvore.bst"
+    )
+
+st.sidebar.markdown("---")
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#          SIDEBAR: Edição persistente (inserir / remover / desfazer)
+# ─────────────────────────────────────────────────────────────────────────── #
+# versions: raízes sucessivas da árvore. Inserções e remoções são persistentes
+# (path copying), então cada versão compartilha com a anterior tudo que não
+# está no caminho alterado, e árvores compartilhadas pelo cache não mudam.
+if "versions" not in st.session_state:
+    st.session_state["versions"] = []
+if not st.session_state["versions"] or st.session_state["versions"][-1] is not st.session_state["root"]:
+    # árvore nova (construída/carregada): o histórico recomeça nela
+    st.session_state["versions"] = [st.session_state["root"]]
+
+def aplicar_versao(nova_raiz) -> None:
+    st.session_state["root"] = nova_raiz
+    st.session_state["tree_version"] += 1
+    # Resetar operações ao alterar a árvore
+    st.session_state["operation"] = "idle"
+    st.session_state["sequence"] = []
+    st.session_state["current_index"] = -1
+    st.session_state["auto_run"] = False
+    st.session_state["target_key"] = None
+
+# Os botões usam on_click: a edição roda antes do script, então o estado do
+# "Desfazer" (habilitado ou não) já reflete a versão criada ou desfeita agora
+def editar_versao(remover: bool, balance: str) -> None:
+    try:
+        chave_edit = int(st.session_state["edit_txt"].strip())
+    except ValueError:
+        st.session_state["edit_feedback"] = ("error", "❌ Use apenas números inteiros para editar.")
+        return
+    raiz_atual = st.session_state["root"]
+    if hasattr(raiz_atual, "tree"):
+        # visões somente leitura (ArrayNode, EytzingerNode): edita-se uma cópia em objetos Node
+        raiz_atual = raiz_atual.tree.to_nodes()
+    if remover:
+        nova_raiz = bst_delete(raiz_atual, chave_edit, balance, persistent=True)
+    else:
+        nova_raiz = bst_insert(raiz_atual, chave_edit, balance, persistent=True)
+    st.session_state["versions"].append(nova_raiz)
+    aplicar_versao(nova_raiz)
+    st.session_state["edit_feedback"] = ("success", f"✅ Versão {len(st.session_state['versions']) - 1} criada.")
+
+def desfazer_versao() -> None:
+    if len(st.session_state["versions"]) < 2:
+        return
+    st.session_state["versions"].pop()
+    aplicar_versao(st.session_state["versions"][-1])
+    st.session_state["edit_feedback"] = (
+        "success", f"↩️ De volta à versão {len(st.session_state['versions']) - 1}."
+    )
+
+st.sidebar.subheader("D) Editar (com histórico de versões)")
+st.sidebar.text_input("✏️ Chave a inserir/remover:", value="", key="edit_txt")
+cols_edit = st.sidebar.columns(3)
+with cols_edit[0]:
+    st.button("➕ Inserir", on_click=editar_versao, args=(False, sel_balance))
+with cols_edit[1]:
+    st.button("➖ Remover", on_click=editar_versao, args=(True, sel_balance))
+with cols_edit[2]:
+    st.button("↩️ Desfazer", on_click=desfazer_versao, disabled=len(st.session_state["versions"]) < 2)
+# mensagem da edição feita no callback, mostrada uma única vez
+edit_feedback = st.session_state.pop("edit_feedback", None)
+if edit_feedback is not None:
+    tipo, mensagem = edit_feedback
+    if tipo == "error":
+        st.sidebar.error(mensagem)
+    else:
+        st.sidebar.success(mensagem)
+
+st.sidebar.markdown("---")
+
 # ─────────────────────────────────────────────────────────────────────────── #
 #                        SIDEBAR: Função de Busca (search_node_ref)
 # ─────────────────────────────────────────────────────────────────────────── #
@@ -293,7 +353,8 @@ if st.sidebar.button("🔍 Iniciar Busca"):
         st.stop()
 
     # Executa a busca e monta a lista de nós visitados na ordem
-    found_node, caminho = search_node_ref(st.session_state["root"], chave_busca)
+    with METRICS.timer("search"):
+        found_node, caminho = search_node_ref(st.session_state["root"], chave_busca)
     # Prepara sequência e estado de operação
     st.session_state["operation"] = "search"
     st.session_state["sequence"] = caminho[:]            # cópia da lista de inteiros
@@ -306,6 +367,53 @@ if st.sidebar.button("🔍 Iniciar Busca"):
     else:
         st.sidebar.info(f"⚠️ Chave {chave_busca} NÃO encontrada (será exibido caminho visitado).")
 
+lote_txt = st.sidebar.text_input("📦 Busca em lote (ex: 10,15,99):", value="")
+if st.sidebar.button("🔍 Buscar Lote"):
+    if st.session_state["root"] is None:
+        st.sidebar.error("❌ Construa a árvore antes de buscar.")
+        st.stop()
+    try:
+        chaves_lote = [int(x.strip()) for x in lote_txt.split(",") if x.strip() != ""]
+    except ValueError:
+        st.sidebar.error("❌ Use apenas números inteiros separados por vírgula.")
+        st.stop()
+    lote = search_many(st.session_state["root"], chaves_lote, with_depth=True)
+    ausentes = [k for k, achou in zip(chaves_lote, lote.found) if not achou]
+    st.sidebar.info(
+        f"{int(lote.found.sum())} de {len(chaves_lote)} chaves encontradas."
+        + (f" Ausentes: {ausentes[:20]}" if ausentes else "")
+    )
+
+st.sidebar.markdown("---")
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#                 SIDEBAR: Consultas por ordem (select, rank, ...)
+# ─────────────────────────────────────────────────────────────────────────── #
+st.sidebar.subheader("2b) Consultas por ordem")
+consultas = {
+    "k-ésima menor (select)": lambda r, a, b: select(r, a),
+    "Posição (rank)": lambda r, a, b: rank(r, a),
+    "Quantas em [a, b]": lambda r, a, b: count_range(r, a, b),
+    "Chaves em [a, b] (até 50)": lambda r, a, b: list(islice(range_keys(r, a, b), 50)),
+    "Piso (floor)": lambda r, a, b: floor(r, a),
+    "Teto (ceiling)": lambda r, a, b: ceiling(r, a),
+    "Antecessor": lambda r, a, b: predecessor(r, a),
+    "Sucessor": lambda r, a, b: successor(r, a),
+}
+sel_consulta = st.sidebar.selectbox("Consulta:", list(consultas))
+consulta_a = st.sidebar.number_input("a (chave ou k, começando em 0):", value=0, step=1)
+consulta_b = st.sidebar.number_input("b (só para intervalo):", value=0, step=1)
+if st.sidebar.button("📐 Consultar"):
+    if st.session_state["root"] is None:
+        st.sidebar.error("❌ Construa a árvore antes de consultar.")
+        st.stop()
+    try:
+        resultado = consultas[sel_consulta](st.session_state["root"], int(consulta_a), int(consulta_b))
+    except IndexError as erro:
+        st.sidebar.error(f"❌ {erro}")
+        st.stop()
+    st.sidebar.info(f"{sel_consulta}: {resultado}")
+
 st.sidebar.markdown("---")
 
 # ─────────────────────────────────────────────────────────────────────────── #
@@ -320,14 +428,16 @@ if st.sidebar.button("▶️ Preparar Caminhamento"):
         st.stop()
 
     # Gera sequência de chaves conforme o tipo de caminhamento
-    if sel_caminhamento == 'Pré-ordem':
-        seq = list(preorder_keys(st.session_state["root"]))
-    elif sel_caminhamento == 'Central':
-        seq = list(inorder_keys(st.session_state["root"]))
-    elif sel_caminhamento == 'Pós-ordem':
-        seq = list(postorder_keys(st.session_state["root"]))
-    else:  # 'Largura'
-        seq = list(breadth_first_keys(st.session_state["root"]))
+    with METRICS.timer("traversal"):
+        if sel_caminhamento == 'Pré-ordem':
+            seq = list(preorder_keys(st.session_state["root"]))
+        elif sel_caminhamento == 'Central':
+            seq = list(inorder_keys(st.session_state["root"]))
+        elif sel_caminhamento == 'Pós-ordem':
+            seq = list(postorder_keys(st.session_state["root"]))
+        else:  # 'Largura'
+            seq = list(breadth_first_keys(st.session_state["root"]))
+    METRICS.count("traversal.node_visits", len(seq))
 
     st.session_state["operation"] = "traversal"
     st.session_state["sequence"] = seq[:]
@@ -341,8 +451,24 @@ st.sidebar.markdown("---")
 # ─────────────────────────────────────────────────────────────────────────── #
 #                        SIDEBAR: Controles Gerais
 # ─────────────────────────────────────────────────────────────────────────── #
-# Este espaço pode ser deixado para adicionar outra funcionalidade, se necessário.
-# Por enquanto, não usamos nada aqui.
+st.sidebar.subheader("4) Visualização de árvores grandes")
+usar_lod = st.sidebar.checkbox(
+    "🔭 Visão resumida (níveis de detalhe)",
+    value=False,
+    help=f"Ligada automaticamente para árvores com mais de {LOD_AUTO_NODES} nós.",
+)
+lod_niveis = st.sidebar.slider("Níveis desenhados:", min_value=1, max_value=12, value=5)
+expandir_txt = st.sidebar.text_input("➕ Expandir subárvore da chave:", value="")
+cols_lod = st.sidebar.columns(2)
+with cols_lod[0]:
+    if st.button("Expandir"):
+        try:
+            st.session_state["lod_expanded"].add(int(expandir_txt.strip()))
+        except ValueError:
+            st.sidebar.error("❌ Use apenas números inteiros para expandir.")
+with cols_lod[1]:
+    if st.button("Recolher tudo"):
+        st.session_state["lod_expanded"] = set()
 
 # ─────────────────────────────────────────────────────────────────────────── #
 #                         TELA PRINCIPAL: Exibição e Controles
@@ -350,14 +476,18 @@ st.sidebar.markdown("---")
 
 st.write("## Visualização da Árvore e Controles de Passo")
 
-# placeholders para gráfico e texto abaixo
-placeholder_tree = st.empty()
-placeholder_info = st.empty()
-
 root = st.session_state["root"]
 
+# Layout SVG da árvore atual, calculado uma vez por árvore no processo e
+# compartilhado entre as sessões que a exibem (a sessão só guarda a raiz)
+def cached_layout_svg() -> str | None:
+    def calcular() -> str | None:
+        with METRICS.timer("render.layout_svg"):
+            return tree_layout_svg(root)
+    return arvores.derived(root, "layout_svg", calcular)
+
 # Função auxiliar para desenhar o estado atual (search ou traversal)
-def render_current_step():
+def render_current_step(placeholder_tree, placeholder_info):
     seq = st.session_state["sequence"]
     idx = st.session_state["current_index"]
     # Se estamos antes do primeiro passo, visited_set = vazio
@@ -372,8 +502,24 @@ def render_current_step():
         if passo_chave == st.session_state["target_key"]:
             target = passo_chave
 
-    dot = build_dot(root, visited_set=visited, found_key=target)
-    placeholder_tree.graphviz_chart(dot)
+    if svg_estatico is not None:
+        # o SVG já está na página (fora do fragmento): a cada passo vai só o CSS
+        placeholder_tree.html(f"<style>{step_style(visited, target)}</style>")
+    elif visao_resumida:
+        # Visão resumida: o grafo é pequeno por construção, então é redesenhado
+        foco = set(st.session_state["lod_expanded"])
+        if idx >= 0:
+            foco.add(seq[idx])
+        with METRICS.timer("render.build_dot"):
+            dot = build_dot_lod(root, visited, target, max_depth=lod_niveis, focus_keys=foco)
+        with METRICS.timer("render.graphviz_chart"):
+            placeholder_tree.graphviz_chart(dot)
+    else:
+        # Sem o executável do Graphviz: layout feito no navegador a cada passo
+        with METRICS.timer("render.build_dot"):
+            dot = build_dot(root, visited_set=visited, found_key=target)
+        with METRICS.timer("render.graphviz_chart"):
+            placeholder_tree.graphviz_chart(dot)
 
     # Informação de texto
     if st.session_state["operation"] == "search":
@@ -402,12 +548,49 @@ def render_current_step():
     else:  # idle
         placeholder_info.warning("🛈 Construa a árvore e inicie busca ou caminhamento para usar os controles de passo.")
 
-# Renderização inicial (ou de acordo com estado)
-if root is None:
-    placeholder_tree.empty()
-    placeholder_info.warning("🛈 Construa a árvore pela sidebar primeiro.")
-else:
-    render_current_step()
+# Árvores grandes (ou com a opção marcada) usam a visão resumida, redesenhada
+# por passo. Nas demais o SVG completo é enviado só nas execuções do script
+# inteiro; o fragmento abaixo manda apenas o CSS do passo, que vale para a
+# página toda: O(passos já dados) por passo em vez de O(n).
+visao_resumida = usar_lod or (root is not None and root.size > LOD_AUTO_NODES)
+svg_estatico = None if root is None or visao_resumida else cached_layout_svg()
+if svg_estatico is not None:
+    st.html(svg_estatico)
+
+# Intervalo (segundos) entre passos no modo "Rodar Tudo"
+PLAYBACK_INTERVAL = 0.8
+
+# O painel da árvore é um fragmento: no modo "Rodar Tudo" só ele é
+# reexecutado a cada intervalo pelo timer do Streamlit, sem time.sleep
+# segurando uma thread e sem rodar o script inteiro a cada passo.
+@st.fragment(run_every=PLAYBACK_INTERVAL if st.session_state["auto_run"] else None)
+def painel_arvore():
+    # placeholders para gráfico e texto abaixo
+    placeholder_tree = st.empty()
+    placeholder_info = st.empty()
+
+    if st.session_state["auto_run"]:
+        seq = st.session_state["sequence"]
+        idx = st.session_state["current_index"]
+        if idx < len(seq) - 1:
+            st.session_state["current_index"] = idx + 1
+        else:
+            # Se alcançou o fim, para o auto_run (o rerun completo desliga o timer)
+            st.session_state["auto_run"] = False
+            st.rerun()
+
+    # Renderização inicial (ou de acordo com estado)
+    if root is None:
+        placeholder_tree.empty()
+        placeholder_info.warning("🛈 Construa a árvore pela sidebar primeiro.")
+    else:
+        render_current_step(placeholder_tree, placeholder_info)
+    # o que muda a cada passo fica no fragmento; o resto do estado, no fim da página
+    st.caption(
+        f"Índice atual: `{st.session_state['current_index']}` · Auto-run: `{st.session_state['auto_run']}`"
+    )
+
+painel_arvore()
 
 # ─────────────────────────────────────────────────────────────────────────── #
 #                       CONTROLES DE PASSO: Voltar / Avançar / Run / Pause
@@ -428,37 +611,19 @@ def start_run_all():
 def pause_run():
     st.session_state["auto_run"] = False
 
-# Apenas mostrar controles se estivermos em busca ou caminhamento
+# Apenas mostrar controles se estivermos em busca ou caminhamento.
+# Os callbacks (on_click) rodam antes do script, então o painel acima
+# já é desenhado com o passo atualizado.
 if st.session_state["operation"] in ["search", "traversal"]:
     cols = st.columns([1, 1, 1, 1])
     with cols[0]:
-        if st.button("⏮️ Voltar 1x"):
-            step_back()
+        st.button("⏮️ Voltar 1x", on_click=step_back)
     with cols[1]:
-        if st.button("⏭️ Avançar 1x"):
-            step_forward()
+        st.button("⏭️ Avançar 1x", on_click=step_forward)
     with cols[2]:
-        if st.button("▶️ Rodar Tudo"):
-            start_run_all()
+        st.button("▶️ Rodar Tudo", on_click=start_run_all)
     with cols[3]:
-        if st.button("⏸️ Pausar"):
-            pause_run()
-
-    # Se auto_run está ativado, avançar automaticamente até o final (com pequeno delay)
-    if st.session_state["auto_run"]:
-        seq = st.session_state["sequence"]
-        idx = st.session_state["current_index"]
-
-        # Se ainda há passos a executar
-        if idx < len(seq) - 1:
-            # Avança um passo
-            st.session_state["current_index"] = idx + 1
-            render_current_step()
-            time.sleep(0.8)
-            st.rerun()
-        else:
-            # Se alcançou o fim, para o auto_run
-            st.session_state["auto_run"] = False
+        st.button("⏸️ Pausar", on_click=pause_run)
 
 # ─────────────────────────────────────────────────────────────────────────── #
 #                            Visualização Final
@@ -466,11 +631,44 @@ if st.session_state["operation"] in ["search", "traversal"]:
 st.markdown("---")
 st.write("### Estado Atual (para debug) ")
 st.write(f"- Operação: `{st.session_state['operation']}`")
-st.write(f"- Índice atual: `{st.session_state['current_index']}`")
 if st.session_state["sequence"]:
     st.write(f"- Sequência total: {st.session_state['sequence']}")
 else:
     st.write(f"- Sequência total: []")
 if st.session_state["target_key"] is not None:
     st.write(f"- Chave alvo (buscar): `{st.session_state['target_key']}`")
-st.write(f"- Auto-run: `{st.session_state['auto_run']}`")
+st.write(f"- Versões no histórico: `{len(st.session_state['versions'])}`")
+
+# Instrumentação (opt-in): contadores e tempos por fase, para todo o processo.
+# Ligar/desligar e zerar valem para todas as sessões, então esses controles
+# só aparecem quando o servidor é iniciado com BST_METRICS_ADMIN=1.
+metricas_admin = os.environ.get("BST_METRICS_ADMIN") == "1"
+if metricas_admin:
+    METRICS.enabled = st.toggle(
+        "📈 Instrumentação do processo (contadores e tempos; vale para todas as sessões)",
+        value=METRICS.enabled,
+    )
+if METRICS.enabled:
+    metricas = METRICS.snapshot()
+    st.write("Tempos por fase (a fase `render.graphviz_chart` mede só o envio: o layout desse caminho é feito no navegador):")
+    st.table([
+        {"fase": fase, "chamadas": dados["calls"], "total (ms)": round(1000 * dados["total_s"], 3),
+         "máx (ms)": round(1000 * dados["max_s"], 3)}
+        for fase, dados in sorted(metricas["phases"].items())
+    ])
+    st.write("Contadores:")
+    st.table([{"contador": nome, "valor": valor} for nome, valor in sorted(metricas["counters"].items())])
+    cols_metricas = st.columns(3)
+    with cols_metricas[0]:
+        st.download_button("⬇️ Logs (JSON lines)", METRICS.to_json_lines(), file_name="bst_metricas.jsonl")
+    with cols_metricas[1]:
+        st.download_button("⬇️ Prometheus", METRICS.to_prometheus(), file_name="bst_metricas.prom")
+    if metricas_admin:
+        with cols_metricas[2]:
+            st.button("🧹 Zerar métricas (de todas as sessões)", on_click=METRICS.reset)
+cache_stats = arvores.stats()
+st.write(
+    f"- Cache de árvores (processo): `{cache_stats['entries']}` árvores, "
+    f"`{cache_stats['nodes']}` nós, `{cache_stats['derived']}` layouts/snapshots, hits `{cache_stats['hits']}`, "
+    f"misses `{cache_stats['misses']}`, evicções `{cache_stats['evictions']}`"
+)
@@ -0,0 +1,55 @@
+"""
+Motor da árvore binária de busca, sem dependência de interface: nós e
+operações (simples ou AVL), armazenamentos somente leitura, percursos,
+consultas, leitura de DOT, processamento paralelo e desenho com Graphviz.
+
+Importar o pacote não carrega streamlit, graphviz nem numpy: graphviz só é
+importado ao montar um grafo (bst.render) e numpy nas buscas em lote.
+Linha de comando: python -m bst --help (de dentro de app/) ou
+python -m app.bst --help (da raiz do repositório).
+"""
+from .cache import TreeCache
+from .dot import DotParseError, parse_dot_stream, parse_dot_to_bst
+from .metrics import METRICS, Metrics
+from .parallel import PARALLEL_MIN_NODES, parallel_build, parallel_search, parallel_traversal
+from .render import LOD_AUTO_NODES, build_dot, build_dot_lod, step_style, tree_layout_svg
+from .search import (
+    BatchLookup,
+    ceiling,
+    count_range,
+    floor,
+    predecessor,
+    range_keys,
+    rank,
+    search_many,
+    search_node_ref,
+    select,
+    sorted_snapshot,
+    successor,
+)
+from .storage import (
+    SNAPSHOT_MAGIC,
+    ArrayNode,
+    ArrayTree,
+    EytzingerNode,
+    EytzingerTree,
+    SnapshotError,
+    load_snapshot,
+    save_snapshot,
+    snapshot_from_buffer,
+    write_snapshot,
+)
+from .traversal import breadth_first_keys, inorder_keys, postorder_keys, preorder_keys
+from .tree import BALANCE_AVL, BALANCE_MODES, BALANCE_NONE, Node, bst_build, bst_delete, bst_insert
+
+__all__ = [
+    "ArrayNode", "ArrayTree", "BALANCE_AVL", "BALANCE_MODES", "BALANCE_NONE", "BatchLookup",
+    "DotParseError", "EytzingerNode", "EytzingerTree", "LOD_AUTO_NODES", "METRICS", "Metrics",
+    "Node", "PARALLEL_MIN_NODES", "SNAPSHOT_MAGIC", "SnapshotError", "TreeCache",
+    "breadth_first_keys", "bst_build", "bst_delete", "bst_insert", "build_dot", "build_dot_lod",
+    "ceiling", "count_range", "floor", "inorder_keys", "load_snapshot", "parallel_build",
+    "parallel_search", "parallel_traversal", "parse_dot_stream", "parse_dot_to_bst",
+    "postorder_keys", "predecessor", "preorder_keys", "range_keys", "rank", "save_snapshot",
+    "search_many", "search_node_ref", "select", "snapshot_from_buffer", "sorted_snapshot",
+    "step_style", "successor", "tree_layout_svg", "write_snapshot",
+]
@@ -0,0 +1,140 @@
+"""
+Linha de comando do motor da árvore, para jobs em lote (sem streamlit).
+
+Entradas aceitas em toda parte:
+    arquivo .bst        snapshot binário (carregado via mmap, sem reconstrução)
+    arquivo .dot/.gv    grafo no formato do app (node<k> + arestas esq/dir)
+    outro arquivo / -   chaves inteiras separadas por espaço, vírgula ou linha
+
+Exemplos (de dentro de app/; da raiz use python -m app.bst):
+    python -m bst build chaves.txt -o arvore.bst --workers 8
+    python -m bst search arvore.bst 42 17 --path
+    python -m bst search arvore.bst --no-verify 42     # snapshot gravado localmente
+    python -m bst search arvore.bst --keys-file consultas.txt
+    python -m bst traverse arvore.dot --order breadth_first > chaves.txt
+"""
+import argparse
+import re
+import sys
+import time
+
+from .dot import parse_dot_stream
+from .parallel import parallel_build, parallel_traversal
+from .search import search_many, search_node_ref
+from .storage import load_snapshot, save_snapshot
+from .tree import BALANCE_MODES, BALANCE_NONE, bst_build
+
+_SEPARATORS = re.compile(r"[\s,;]+")
+
+def read_keys(path: str) -> list[int]:
+    """Chaves inteiras de um arquivo texto ('-' lê da entrada padrão)."""
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    return [int(token) for token in _SEPARATORS.split(text) if token]
+
+def load_tree(path: str, balance: str = BALANCE_NONE, insertion_shape: bool = False,
+              workers: int | None = None, verify: bool = True):
+    """
+    Carrega a árvore de um snapshot, de um DOT ou de uma lista de chaves.
+    verify=False pula a conferência das colunas do snapshot (load_snapshot).
+    """
+    if path.endswith(".bst"):
+        return load_snapshot(path, verify).root
+    if path.endswith((".dot", ".gv")):
+        with open(path, "rb") as f:
+            return parse_dot_stream(f)
+    keys = read_keys(path)
+    if workers is not None:
+        return parallel_build(keys, workers).root
+    return bst_build(keys, balance, insertion_shape=insertion_shape)
+
+def _write_keys(keys) -> None:
+    out = sys.stdout
+    for key in keys:
+        out.write(f"{key}\n")
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#                               Subcomandos
+# ─────────────────────────────────────────────────────────────────────────── #
+def cmd_build(args) -> int:
+    start = time.perf_counter()
+    root = load_tree(args.source, args.balance, args.insertion_shape, args.workers, args.verify)
+    elapsed = time.perf_counter() - start
+    print(f"{root.size if root is not None else 0} nós em {elapsed:.3f}s", file=sys.stderr)
+    if args.output:
+        save_snapshot(root, args.output)
+        print(f"snapshot gravado em {args.output}", file=sys.stderr)
+    return 0
+
+def cmd_search(args) -> int:
+    root = load_tree(args.source, args.balance, args.insertion_shape, verify=args.verify)
+    keys = list(args.keys) + (read_keys(args.keys_file) if args.keys_file else [])
+    if not keys:
+        print("nenhuma chave para buscar", file=sys.stderr)
+        return 2
+    if args.path:
+        for key in keys:
+            node, path = search_node_ref(root, key)
+            status = "encontrada" if node is not None else "ausente"
+            print(f"{key}\t{status}\t{' -> '.join(map(str, path))}")
+    else:
+        result = search_many(root, keys, with_depth=True)
+        for key, found, depth in zip(keys, result.found.tolist(), result.depths.tolist()):
+            print(f"{key}\t{'encontrada' if found else 'ausente'}\t{depth}")
+    return 0
+
+def cmd_traverse(args) -> int:
+    root = load_tree(args.source, args.balance, args.insertion_shape, verify=args.verify)
+    # sem --workers: um worker, isto é, o gerador sequencial escrito sob demanda
+    _write_keys(parallel_traversal(root, args.order, args.workers or 1))
+    return 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="bst", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(name: str, handler, help_text: str) -> argparse.ArgumentParser:
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        command.add_argument("source", help="árvore: .bst, .dot/.gv ou arquivo de chaves ('-' = stdin)")
+        command.add_argument("--balance", choices=BALANCE_MODES, default=BALANCE_NONE,
+                             help=f"balanceamento ao construir de chaves (padrão {BALANCE_NONE})")
+        command.add_argument("--insertion-shape", action="store_true",
+                             help="mantém a forma da inserção sequencial em vez da árvore balanceada")
+        command.add_argument("--no-verify", dest="verify", action="store_false",
+                             help="não confere as colunas de um snapshot .bst (só para arquivos gravados pelo motor)")
+        command.set_defaults(handler=handler)
+        return command
+
+    build = add_command("build", cmd_build, "constrói a árvore e, opcionalmente, grava o snapshot")
+    build.add_argument("-o", "--output", help="arquivo .bst de saída")
+    build.add_argument("--workers", type=int,
+                       help="constrói em paralelo com N processos (árvore balanceada, ignora --insertion-shape)")
+
+    search = add_command("search", cmd_search, "busca chaves e mostra se existem (e a profundidade ou o caminho)")
+    search.add_argument("keys", nargs="*", type=int, help="chaves a buscar")
+    search.add_argument("--keys-file", help="arquivo com mais chaves a buscar ('-' = stdin)")
+    search.add_argument("--path", action="store_true", help="mostra o caminho visitado de cada busca")
+
+    traverse = add_command("traverse", cmd_traverse, "escreve as chaves na ordem do percurso, uma por linha")
+    traverse.add_argument("--order", default="inorder",
+                          choices=("preorder", "inorder", "postorder", "breadth_first"))
+    traverse.add_argument("--workers", type=int, help="percorre em paralelo com N processos")
+
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ValueError) as erro:
+        # DotParseError e SnapshotError são ValueError: mensagem curta, sem traceback
+        print(f"erro: {erro}", file=sys.stderr)
+        return 1
+    except OverflowError:
+        # colunas compactas (--workers, percurso paralelo) guardam chaves em int64
+        print("erro: chaves fora do intervalo de 64 bits só funcionam sem --workers", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
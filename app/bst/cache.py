@@ -0,0 +1,95 @@
+"""Cache de árvores por hash do conteúdo da entrada, compartilhável entre sessões."""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from .tree import Node, _size
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#   Cache de árvores compartilhado pelo processo: entradas iguais (mesmo
+#   hash de conteúdo) geram uma única árvore, usada por todas as sessões.
+# ─────────────────────────────────────────────────────────────────────────── #
+class TreeCache:
+    """
+    Cache LRU de árvores imutáveis, com limite de entradas e de nós somados.
+    As árvores devolvidas são compartilhadas: quem as usa não pode alterá-las
+    no lugar (use as operações persistentes ou reconstrua a partir da entrada).
+    Valores derivados de uma árvore (layout SVG, bytes do snapshot) ficam
+    aqui também, num LRU próprio de até max_derived entradas (veja derived).
+    """
+
+    def __init__(self, max_entries: int = 32, max_nodes: int = 5_000_000, max_derived: int = 64):
+        self.max_entries = max_entries
+        self.max_nodes = max_nodes
+        self.max_derived = max_derived
+        self._entries: OrderedDict[str, Node | None] = OrderedDict()
+        self._derived: OrderedDict[tuple[int, str], tuple[Node | None, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_nodes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key_for(kind: str, *parts) -> str:
+        """Hash do conteúdo da entrada (tipo + partes: texto, bytes, opções...)."""
+        digest = hashlib.sha256(kind.encode())
+        for part in parts:
+            digest.update(b"\0")
+            digest.update(part if isinstance(part, bytes) else repr(part).encode())
+        return digest.hexdigest()
+
+    def get_or_build(self, key: str, build) -> Node | None:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # Construção fora do lock: sessões com entradas diferentes não se bloqueiam
+        root = build()
+        with self._lock:
+            if key in self._entries:        # outra sessão terminou primeiro
+                return self._entries[key]
+            self._entries[key] = root
+            self.total_nodes += _size(root)
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self.total_nodes > self.max_nodes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self.total_nodes -= _size(evicted)
+                self.evictions += 1
+        return root
+
+    def derived(self, root: Node | None, name: str, build):
+        """
+        Valor derivado da árvore de 'root' (ex.: "layout_svg"), calculado uma
+        vez por processo e reaproveitado por todas as sessões com essa raiz,
+        inclusive versões editadas, que não passam por get_or_build. A chave é
+        a identidade da raiz; a entrada guarda a própria raiz, então o id não
+        pode ser reaproveitado por outra árvore enquanto ela estiver aqui.
+        """
+        key = (id(root), name)
+        with self._lock:
+            entry = self._derived.get(key)
+            if entry is not None and entry[0] is root:
+                self._derived.move_to_end(key)
+                return entry[1]
+        value = build()
+        with self._lock:
+            self._derived[key] = (root, value)
+            self._derived.move_to_end(key)
+            while len(self._derived) > self.max_derived:
+                self._derived.popitem(last=False)
+        return value
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "derived": len(self._derived),
+                "nodes": self.total_nodes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
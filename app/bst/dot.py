@@ -0,0 +1,130 @@
+"""Leitura de texto DOT (Graphviz) para a estrutura de BST."""
+import io
+import re
+
+from .metrics import METRICS
+from .tree import Node, _recompute_metadata
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#      Função para transformar texto DOT (Graphviz) em estrutura de BST
+# ─────────────────────────────────────────────────────────────────────────── #
+class DotParseError(ValueError):
+    """O texto DOT não descreve uma única BST válida (ciclo, dois pais, ordem etc.)."""
+
+# Uma única expressão por linha, reconhecendo (nesta ordem):
+#    aresta:   "node5":esq -> "node4"   ou   node5:esq->node4
+#    nó:       node5[label = ...]
+_DOT_TOKEN = re.compile(
+    r'"?node(?P<parent>\d+)"?\s*:(?P<port>\w+)\s*->\s*"?node(?P<child>\d+)"?'
+    r'|\bnode(?P<node>\d+)\s*\['
+)
+
+def _iter_lines(source):
+    """Lê linha a linha de um arquivo texto/binário ou de um mmap."""
+    readline = source.readline
+    while True:
+        line = readline()
+        if not line:
+            return
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        yield line
+
+def parse_dot_stream(source) -> Node:
+    """
+    Constrói a BST lendo o DOT linha a linha de 'source' (qualquer objeto com
+    readline(): arquivo aberto, io.StringIO, mmap...), em uma única passada.
+    Nós e arestas "esq"/"dir" são criados conforme aparecem; cada aresta é
+    validada na hora (filho no lado certo, no máximo um pai, sem laço).
+    No fim confere que há exatamente uma raiz, que todos os nós são alcançados
+    a partir dela (sem ciclos) e que a propriedade de BST vale globalmente.
+    Lança DotParseError se algo não bater.
+    """
+    # Além da própria árvore, só o dicionário chave -> nó. Enquanto lê,
+    # node.size marca se o nó já tem pai (0 = não, 1 = sim); no fim
+    # _recompute_metadata devolve a size o seu significado normal.
+    nodes: dict[int, Node] = {}
+
+    def get_node(key: int) -> Node:
+        node = nodes.get(key)
+        if node is None:
+            node = nodes[key] = Node(key)
+            node.size = 0
+        return node
+
+    for line_no, line in enumerate(_iter_lines(source), start=1):
+        for match in _DOT_TOKEN.finditer(line):
+            if match.group("node") is not None:
+                get_node(int(match.group("node")))
+                continue
+
+            parent_key = int(match.group("parent"))
+            child_key = int(match.group("child"))
+            port_name = match.group("port").lower()
+            if port_name not in ("esq", "dir"):
+                continue
+
+            parent_node = get_node(parent_key)
+            child_node = get_node(child_key)
+            if port_name == "esq":
+                if child_key >= parent_key:
+                    raise DotParseError(f"linha {line_no}: {child_key} não pode ficar à esquerda de {parent_key}")
+                current = parent_node.left
+            else:
+                if child_key <= parent_key:
+                    raise DotParseError(f"linha {line_no}: {child_key} não pode ficar à direita de {parent_key}")
+                current = parent_node.right
+            if current is child_node:
+                continue    # aresta repetida
+            if current is not None:
+                raise DotParseError(f"linha {line_no}: nó {parent_key} já tem filho '{port_name}' ({current.key})")
+            if child_node.size:
+                raise DotParseError(f"linha {line_no}: nó {child_key} tem mais de um pai")
+
+            if port_name == "esq":
+                parent_node.left = child_node
+            else:
+                parent_node.right = child_node
+            child_node.size = 1
+
+    if not nodes:
+        raise DotParseError("nenhum nó 'node<número>' encontrado")
+    # raiz: o único nó sem pai (uma passada sobre os nós, sem estrutura extra)
+    roots = 0
+    for node in nodes.values():
+        if not node.size:
+            root, roots = node, roots + 1
+    if roots != 1:
+        raise DotParseError(f"esperada exatamente uma raiz, encontradas {roots}")
+
+    # Passada final sobre a árvore: limites (lo, hi) de cada subárvore garantem
+    # a ordem global, e a contagem de alcançados detecta ciclos desconectados
+    reached = 0
+    stack: list[tuple[Node, int | None, int | None]] = [(root, None, None)]
+    while stack:
+        node, lo, hi = stack.pop()
+        reached += 1
+        if (lo is not None and node.key <= lo) or (hi is not None and node.key >= hi):
+            raise DotParseError(f"nó {node.key} viola a ordem da BST")
+        if node.left is not None:
+            stack.append((node.left, lo, node.key))
+        if node.right is not None:
+            stack.append((node.right, node.key, hi))
+    if reached != len(nodes):
+        raise DotParseError(f"{len(nodes) - reached} nó(s) fora da árvore (ciclo ou componente solto)")
+
+    _recompute_metadata(root)
+    METRICS.count("dot.lines", line_no)
+    METRICS.count("nodes.allocated", len(nodes))
+    return root
+
+def parse_dot_to_bst(dot_text: str) -> Node | None:
+    """
+    Recebe o texto DOT (Graphviz) e constrói os nós com as arestas "esq" e "dir".
+    Retorna a raiz da BST encontrada, ou None se o texto não descrever uma BST
+    válida (veja parse_dot_stream para obter o motivo do erro).
+    """
+    try:
+        return parse_dot_stream(io.StringIO(dot_text))
+    except DotParseError:
+        return None
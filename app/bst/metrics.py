@@ -0,0 +1,88 @@
+"""
+Instrumentação opcional: contadores e tempos por fase, exportáveis em JSON
+(uma linha por evento) ou no formato texto do Prometheus.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#   Instrumentação opcional: contadores e tempos por fase. Desligada, cada
+#   ponto instrumentado custa só a checagem de METRICS.enabled.
+# ─────────────────────────────────────────────────────────────────────────── #
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.counters: dict[str, int] = {}
+        self.phases: dict[str, list[float]] = {}   # fase -> [chamadas, soma, máximo] (segundos)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def timer(self, phase: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self.phases.setdefault(phase, [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.phases.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "phases": {
+                    phase: {"calls": int(calls), "total_s": total, "max_s": peak}
+                    for phase, (calls, total, peak) in self.phases.items()
+                },
+            }
+
+    def to_json_lines(self) -> str:
+        """Um evento JSON por linha (logs estruturados)."""
+        now = time.time()
+        data = self.snapshot()
+        lines = [
+            json.dumps({"ts": now, "type": "counter", "name": name, "value": value})
+            for name, value in sorted(data["counters"].items())
+        ]
+        lines += [
+            json.dumps({"ts": now, "type": "phase", "name": phase, **stats})
+            for phase, stats in sorted(data["phases"].items())
+        ]
+        return "\n".join(lines) + "\n"
+
+    def to_prometheus(self) -> str:
+        """Formato texto de exposição do Prometheus."""
+        data = self.snapshot()
+        out = ["# TYPE bst_events_total counter"]
+        for name, value in sorted(data["counters"].items()):
+            out.append(f'bst_events_total{{name="{name}"}} {value}')
+        out.append("# TYPE bst_phase_seconds summary")
+        for phase, stats in sorted(data["phases"].items()):
+            out.append(f'bst_phase_seconds_count{{phase="{phase}"}} {stats["calls"]}')
+            out.append(f'bst_phase_seconds_sum{{phase="{phase}"}} {stats["total_s"]:.9f}')
+        out.append("# TYPE bst_phase_seconds_max gauge")
+        for phase, stats in sorted(data["phases"].items()):
+            out.append(f'bst_phase_seconds_max{{phase="{phase}"}} {stats["max_s"]:.9f}')
+        return "\n".join(out) + "\n"
+
+# Instância única do processo, usada por todas as funções da árvore
+METRICS = Metrics()
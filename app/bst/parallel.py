@@ -0,0 +1,288 @@
+"""Construção, percursos e busca em lote paralelos para árvores grandes."""
+import multiprocessing
+import os
+from array import array
+from contextlib import contextmanager
+
+from .metrics import METRICS
+from .search import BatchLookup, _key_array
+from .storage import ArrayTree
+from .traversal import breadth_first_keys, inorder_keys, postorder_keys, preorder_keys
+from .tree import Node, _build_balanced, _size
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#   Processamento paralelo para árvores grandes (milhões de chaves): a árvore
+#   é cortada em uma profundidade fixa e cada subárvore abaixo do corte vai
+#   para um processo do pool; o processo pai só costura as partes em ordem.
+# ─────────────────────────────────────────────────────────────────────────── #
+PARALLEL_MIN_NODES = 200_000   # abaixo disso o custo do pool não compensa
+
+# Entradas dos workers. Os processos são criados por fork depois que estas
+# variáveis são preenchidas, então herdam a árvore (ou as chaves) sem cópia
+# nem serialização; cada tarefa leva só o caminho até a sua subárvore.
+_PARALLEL_ROOT = None
+_PARALLEL_KEYS = None
+
+def _parallel_workers(workers: int | None, n: int) -> int:
+    """Nº de processos a usar; 1 quando não compensa ou não há fork."""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        # com spawn os workers não herdariam a árvore e ela teria de ser serializada
+        return 1
+    workers = workers or os.cpu_count() or 1
+    return workers if n >= PARALLEL_MIN_NODES else 1
+
+@contextmanager
+def _fork_pool(workers: int, root=None, keys=None):
+    global _PARALLEL_ROOT, _PARALLEL_KEYS
+    _PARALLEL_ROOT, _PARALLEL_KEYS = root, keys
+    try:
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            yield pool
+    finally:
+        _PARALLEL_ROOT = _PARALLEL_KEYS = None
+
+def _split_depth(workers: int) -> int:
+    # ~4 subárvores por worker, para equilibrar a carga
+    return (4 * workers - 1).bit_length()
+
+def _follow(root, path: str):
+    """Desce a partir da raiz seguindo um caminho como "LRL"."""
+    node = root
+    for step in path:
+        node = node.left if step == "L" else node.right
+    return node
+
+def _frontier(root, depth: int) -> list[str]:
+    """Caminhos dos nós exatamente na profundidade 'depth', da esquerda para a direita."""
+    level = [("", root)] if root is not None else []
+    for _ in range(depth):
+        level = [(path + step, child)
+                 for path, node in level
+                 for step, child in (("L", node.left), ("R", node.right))
+                 if child is not None]
+    return [path for path, _ in level]
+
+# ----- Construção -------------------------------------------------------------
+def _balanced_columns(task: tuple[int, int, int]):
+    """
+    Worker: monta em colunas a subárvore balanceada das chaves [lo, hi) de
+    _PARALLEL_KEYS, já com os índices de pré-ordem finais (a partir de 'start').
+    Mesma divisão pelo meio de _build_balanced, então a forma é idêntica.
+    """
+    lo, hi, start = task
+    keys = _PARALLEL_KEYS
+    count = hi - lo
+    out_keys = array("q", bytes(8 * count))
+    left = array("i", [-1]) * count
+    right = array("i", [-1]) * count
+    sizes = array("i", bytes(4 * count))
+    # (início, fim, índice em pré-ordem) de cada faixa ainda não montada
+    stack = [(lo, hi, start)]
+    while stack:
+        lo, hi, index = stack.pop()
+        mid = (lo + hi) // 2
+        local = index - start
+        out_keys[local] = keys[mid]
+        sizes[local] = hi - lo
+        if lo < mid:
+            left[local] = index + 1
+            stack.append((lo, mid, index + 1))
+        if mid + 1 < hi:
+            right[local] = index + 1 + (mid - lo)
+            stack.append((mid + 1, hi, index + 1 + (mid - lo)))
+    return start, out_keys, left, right, sizes
+
+def parallel_build(keys, workers: int | None = None) -> ArrayTree:
+    """
+    Constrói a árvore balanceada (mesma forma de bst_build) direto no formato
+    compacto de ArrayTree. Os níveis de cima são montados aqui; cada faixa
+    abaixo do corte vira uma tarefa do pool, que devolve suas colunas já com
+    os índices finais: a costura é só cópia de fatias.
+    Em pré-ordem, a faixa [lo, hi) que começa no índice s tem a metade
+    esquerda começando em s + 1 e a direita em s + 1 + (mid - lo).
+    """
+    sorted_keys = array("q", sorted(set(keys)))
+    n = len(sorted_keys)
+    workers = _parallel_workers(workers, n)
+    if workers == 1:
+        return ArrayTree.from_root(_build_balanced(list(sorted_keys)))
+
+    tree = ArrayTree(array("q", bytes(8 * n)), array("i", [-1]) * n,
+                     array("i", [-1]) * n, array("i", bytes(4 * n)))
+    depth, tasks = _split_depth(workers), []
+    stack = [(0, n, 0, 0)]              # (início, fim, índice em pré-ordem, profundidade)
+    while stack:
+        lo, hi, index, level = stack.pop()
+        if level == depth:
+            tasks.append((lo, hi, index))
+            continue
+        mid = (lo + hi) // 2
+        tree.keys[index] = sorted_keys[mid]
+        tree.sizes[index] = hi - lo
+        if lo < mid:
+            tree.left[index] = index + 1
+            stack.append((lo, mid, index + 1, level + 1))
+        if mid + 1 < hi:
+            tree.right[index] = index + 1 + (mid - lo)
+            stack.append((mid + 1, hi, index + 1 + (mid - lo), level + 1))
+
+    with _fork_pool(workers, keys=sorted_keys) as pool:
+        for start, *columns in pool.imap_unordered(_balanced_columns, tasks):
+            end = start + len(columns[0])
+            for target, column in zip((tree.keys, tree.left, tree.right, tree.sizes), columns):
+                target[start:end] = column
+    METRICS.count("nodes.allocated", n)
+    return tree
+
+# ----- Percursos ---------------------------------------------------------------
+_TRAVERSALS = {
+    "preorder": preorder_keys,
+    "inorder": inorder_keys,
+    "postorder": postorder_keys,
+}
+
+def _traverse_block(task: tuple[str, str]):
+    """Worker: percorre a subárvore em 'path'. Em largura devolve um array por nível."""
+    order, path = task
+    node = _follow(_PARALLEL_ROOT, path)
+    if order != "breadth_first":
+        return array("q", _TRAVERSALS[order](node))
+    levels, level = [], [node]
+    while level:
+        levels.append(array("q", (n.key for n in level)))
+        level = [child for n in level for child in (n.left, n.right) if child is not None]
+    return levels
+
+def parallel_traversal(root: Node | None, order: str = "inorder", workers: int | None = None):
+    """
+    Percurso completo ("preorder", "inorder", "postorder" ou "breadth_first")
+    com as subárvores abaixo do corte percorridas em paralelo. Devolve as
+    chaves na mesma ordem do gerador sequencial correspondente, em array int64.
+    Com um só worker devolve o próprio gerador sequencial: as chaves saem sob
+    demanda e podem ter qualquer tamanho (o array exige int64).
+    O corte é por profundidade: em árvores muito desbalanceadas sobra pouco
+    paralelismo, mas o resultado continua correto.
+    """
+    sequential = {**_TRAVERSALS, "breadth_first": breadth_first_keys}
+    if order not in sequential:
+        raise ValueError(f"percurso desconhecido: {order!r}")
+    workers = _parallel_workers(workers, _size(root))
+    if workers == 1:
+        return sequential[order](root)
+
+    depth = _split_depth(workers)
+    paths = _frontier(root, depth)
+    with _fork_pool(workers, root=root) as pool:
+        blocks = dict(zip(paths, pool.map(_traverse_block, [(order, p) for p in paths])))
+
+    out = array("q")
+    if order == "breadth_first":
+        # níveis acima do corte, depois cada nível abaixo juntando os blocos
+        # da esquerda para a direita
+        level = [root]
+        for _ in range(depth):
+            out.extend(node.key for node in level)
+            level = [child for node in level for child in (node.left, node.right) if child is not None]
+        for k in range(max((len(b) for b in blocks.values()), default=0)):
+            for path in paths:
+                if k < len(blocks[path]):
+                    out.extend(blocks[path][k])
+        return out
+
+    # acima do corte a árvore é pequena: percorre com pilha e, ao chegar na
+    # profundidade do corte, emenda o bloco já calculado daquela subárvore
+    stack = [(root, "", False)]
+    while stack:
+        node, path, expanded = stack.pop()
+        if len(path) == depth:
+            out.extend(blocks[path])
+        elif expanded:
+            out.append(node.key)
+        else:
+            children = [(child, path + step, False)
+                        for step, child in (("L", node.left), ("R", node.right))
+                        if child is not None]
+            me = (node, path, True)
+            # a pilha inverte: empilha na ordem contrária à desejada
+            if order == "preorder":
+                stack.extend(children[::-1] + [me])
+            elif order == "inorder":
+                stack.extend([c for c in children if c[1][-1] == "R"] + [me]
+                             + [c for c in children if c[1][-1] == "L"])
+            else:
+                stack.extend([me] + children[::-1])
+    return out
+
+# ----- Busca em lote -----------------------------------------------------------
+def _search_subtree(subtree, queries: "np.ndarray") -> "np.ndarray":
+    """Profundidade (relativa à subárvore) de cada chave consultada, ou -1."""
+    import numpy as np
+
+    depths = np.full(len(queries), -1, dtype=np.int64)
+    for i, key in enumerate(queries.tolist()):
+        node, depth = subtree, 0
+        while node is not None:
+            if key == node.key:
+                depths[i] = depth
+                break
+            node, depth = (node.left if key < node.key else node.right), depth + 1
+    return depths
+
+def _search_block(task: tuple[str, "np.ndarray"]) -> "np.ndarray":
+    path, queries = task
+    return _search_subtree(_follow(_PARALLEL_ROOT, path), queries)
+
+def parallel_search(root: Node | None, keys, workers: int | None = None) -> BatchLookup:
+    """
+    Busca em lote sem montar o snapshot ordenado de search_many: cada chave é
+    encaminhada pelos níveis acima do corte (vetorizado, via searchsorted nas
+    chaves desses níveis) para a subárvore em que cairia, e cada subárvore
+    resolve suas chaves em um worker. found/depths voltam na ordem da entrada.
+    """
+    import numpy as np
+
+    queries = _key_array(keys)
+    workers = _parallel_workers(workers, _size(root))
+    depth = _split_depth(workers) if workers > 1 else 0
+
+    # parte de cima em ordem: chaves, profundidades e, antes/entre/depois
+    # delas, o caminho da subárvore do corte que cobre cada intervalo (ou None)
+    top_keys, top_depths, gaps = [], [], []
+    stack, current, path = [], root, ""
+    while True:
+        while current is not None and len(path) < depth:
+            stack.append((current, path))
+            current, path = current.left, path + "L"
+        gaps.append(path if current is not None else None)
+        if not stack:
+            break
+        node, path = stack.pop()
+        top_keys.append(node.key)
+        top_depths.append(len(path))
+        current, path = node.right, path + "R"
+
+    depths = np.full(len(queries), -1, dtype=np.int64)
+    top = _key_array(top_keys)
+    if top.dtype != queries.dtype:
+        queries, top = queries.astype(object), top.astype(object)
+    pos = np.searchsorted(top, queries)
+    hit = np.zeros(len(queries), dtype=bool)
+    if len(top):
+        # posição além do fim aponta para a última chave, que então não bate
+        hit = (top[np.minimum(pos, len(top) - 1)] == queries).astype(bool, copy=False)
+        depths[hit] = np.array(top_depths, dtype=np.int64)[pos[hit]]
+
+    tasks, slots = [], []
+    for gap, path in enumerate(gaps):
+        index = np.nonzero(~hit & (pos == gap))[0]
+        if path is not None and len(index):
+            tasks.append((path, queries[index]))
+            slots.append(index)
+    if workers > 1 and tasks:
+        with _fork_pool(workers, root=root) as pool:
+            results = pool.map(_search_block, tasks)
+    else:
+        results = [_search_subtree(_follow(root, path), q) for path, q in tasks]
+    for (path, _), index, block in zip(tasks, slots, results):
+        depths[index] = np.where(block >= 0, block + len(path), -1)
+    return BatchLookup(depths >= 0, depths, None)
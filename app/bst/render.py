@@ -0,0 +1,155 @@
+"""
+Desenho da árvore com Graphviz: grafo completo, layout SVG reaproveitável,
+CSS por passo e visão resumida (LOD).
+O pacote graphviz só é importado aqui, e só quando um grafo é montado.
+"""
+from typing import TYPE_CHECKING
+
+from .metrics import METRICS
+from .search import search_node_ref
+from .tree import Node, _size
+
+if TYPE_CHECKING:
+    from graphviz import Digraph
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#   Função para construir o grafo Graphviz colorindo nós visitados e,
+#   opcionalmente, o nó encontrado em outra cor (por ex. lightgreen).
+# ─────────────────────────────────────────────────────────────────────────── #
+def _svg_node_id(key: int) -> str:
+    return f"bst-n{key}"
+
+def build_dot(root: Node | None, visited_set: set[int], found_key: int | None = None) -> "Digraph":
+    """
+    - visited_set: conjunto de chaves de nós que já foram visitados (coloridos de lightblue)
+    - found_key: se não for None, o nó com chave == found_key será colorido de lightgreen.
+    Cada nó recebe um id estável no SVG gerado (veja tree_layout_svg).
+    """
+    from graphviz import Digraph
+
+    dot = Digraph(format="png")
+    dot.attr("node", shape="circle", style="filled", color="black")
+
+    stack = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        if found_key is not None and node.key == found_key:
+            fill = "lightgreen"
+        elif node.key in visited_set:
+            fill = "lightblue"
+        else:
+            fill = "white"
+
+        dot.node(str(node.key), id=_svg_node_id(node.key), fillcolor=fill)
+
+        left, right = node.left, node.right
+        if left is not None:
+            dot.edge(str(node.key), str(left.key))
+        if right is not None:
+            dot.edge(str(node.key), str(right.key))
+            stack.append(right)
+        if left is not None:
+            stack.append(left)
+    METRICS.count("render.dot_statements", len(dot.body))
+    return dot
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#   Renderização incremental: o layout (SVG) é calculado uma vez por árvore
+#   e cada passo só acrescenta regras CSS para os nós que mudaram de cor.
+# ─────────────────────────────────────────────────────────────────────────── #
+def tree_layout_svg(root: Node | None) -> str | None:
+    """
+    Executa o layout do Graphviz uma única vez (todos os nós brancos) e
+    retorna o SVG. Retorna None se o executável 'dot' não estiver instalado.
+    """
+    from graphviz import ExecutableNotFound
+
+    try:
+        svg = build_dot(root, set()).pipe(format="svg", encoding="utf-8")
+    except ExecutableNotFound:
+        return None
+    # descarta o prólogo XML/DOCTYPE para poder embutir o SVG no HTML
+    return svg[svg.index("<svg"):]
+
+def step_style(visited_set: set[int], found_key: int | None = None) -> str:
+    """
+    Gera o CSS que pinta os nós de um passo sobre o SVG já calculado.
+    Custa O(nós destacados), independente do tamanho da árvore.
+    """
+    rules = []
+    if visited_set:
+        selectors = ", ".join(f"#{_svg_node_id(k)} ellipse" for k in visited_set)
+        rules.append(f"{selectors} {{ fill: lightblue; }}")
+    if found_key is not None:
+        rules.append(f"#{_svg_node_id(found_key)} ellipse {{ fill: lightgreen; }}")
+    return "\n".join(rules)
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#   Níveis de detalhe (LOD): desenha só o topo da árvore e o entorno do foco;
+#   o restante aparece como nós-resumo (quantidade e faixa de chaves).
+# ─────────────────────────────────────────────────────────────────────────── #
+LOD_AUTO_NODES = 300   # acima disso o app usa a visão resumida automaticamente
+
+def _subtree_summary(node: Node) -> tuple[int, int, int]:
+    """(quantidade de nós, menor chave, maior chave) da subárvore de 'node'."""
+    lowest = node
+    while lowest.left is not None:
+        lowest = lowest.left
+    highest = node
+    while highest.right is not None:
+        highest = highest.right
+    return _size(node), lowest.key, highest.key
+
+def build_dot_lod(
+    root: Node | None,
+    visited_set: set[int],
+    found_key: int | None = None,
+    max_depth: int = 5,
+    focus_keys=(),
+) -> "Digraph":
+    """
+    Como build_dot, mas só abre os nós até a profundidade 'max_depth' e os nós
+    no caminho da raiz até cada chave de 'focus_keys' (cursor da busca ou do
+    caminhamento, subárvores expandidas pelo usuário). Cada filho de um nó
+    aberto que não deve ser aberto vira um único nó-resumo "+N [min..max]".
+    """
+    from graphviz import Digraph
+
+    open_keys: set[int] = set()
+    for key in focus_keys:
+        open_keys.update(search_node_ref(root, key)[1])
+
+    dot = Digraph(format="png")
+    dot.attr("node", shape="circle", style="filled", color="black")
+
+    stack = [(root, 0)] if root is not None else []
+    while stack:
+        node, depth = stack.pop()
+        if depth >= max_depth and node.key not in open_keys:
+            count, lowest, highest = _subtree_summary(node)
+            dot.node(
+                str(node.key),
+                label=f"+{count}\n[{lowest}..{highest}]",
+                id=f"bst-s{node.key}",
+                shape="box",
+                fillcolor="lightgray",
+            )
+            continue
+
+        if found_key is not None and node.key == found_key:
+            fill = "lightgreen"
+        elif node.key in visited_set:
+            fill = "lightblue"
+        else:
+            fill = "white"
+        dot.node(str(node.key), id=_svg_node_id(node.key), fillcolor=fill)
+
+        left, right = node.left, node.right
+        if left is not None:
+            dot.edge(str(node.key), str(left.key))
+        if right is not None:
+            dot.edge(str(node.key), str(right.key))
+            stack.append((right, depth + 1))
+        if left is not None:
+            stack.append((left, depth + 1))
+    return dot
@@ -0,0 +1,237 @@
+"""
+Consultas: busca com registro do caminho, busca em lote (NumPy),
+estatísticas de ordem e varredura de intervalos.
+"""
+from typing import NamedTuple
+
+from .metrics import METRICS
+from .tree import Node, _size
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#       Função que percorre a árvore buscando uma chave e retorna:
+#       1) o nó encontrado (ou None)
+#       2) a lista de chaves visitadas, em ordem
+# ─────────────────────────────────────────────────────────────────────────── #
+def search_node_ref(root: Node | None, key: int) -> tuple[Node | None, list[int]]:
+    """
+    Percorre a BST iterativamente, acumulando cada nó visitado em uma lista.
+    Se encontrar 'key', retorna (nó_encontrado, caminho_lista). Caso contrário,
+    retorna (None, caminho_lista) após esgotar a busca.
+    """
+    if hasattr(root, "search_path"):
+        # layout congelado (EytzingerNode): desce por índices, sem criar uma visão por nível
+        current, visited_list = root.search_path(key)
+    else:
+        visited_list: list[int] = []
+        current = root
+        while current is not None:
+            visited_list.append(current.key)
+            if key == current.key:
+                break
+            elif key < current.key:
+                current = current.left
+            else:  # key > current.key
+                current = current.right
+    if METRICS.enabled:
+        # contado no fim (e não a cada nó) para não pesar no laço:
+        # cada nó faz uma comparação de igualdade e, se diferente, uma de ordem
+        METRICS.count("search.calls")
+        METRICS.count("search.node_visits", len(visited_list))
+        METRICS.count("search.comparisons", 2 * len(visited_list) - (current is not None))
+    return current, visited_list
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#      Busca em lote: muitas chaves de uma vez, vetorizada com NumPy
+# ─────────────────────────────────────────────────────────────────────────── #
+class BatchLookup(NamedTuple):
+    found: "np.ndarray"                 # bool, uma posição por chave consultada
+    depths: "np.ndarray | None"         # profundidade do nó (raiz = 0) ou -1
+    paths: list[list[int]] | None       # caminhos visitados, só se pedidos
+
+def _key_array(values) -> "np.ndarray":
+    """
+    Chaves como array int64; se alguma não couber (um Node aceita qualquer
+    int), cai para dtype object, que compara inteiros Python sem limite.
+    """
+    import numpy as np
+
+    if isinstance(values, np.ndarray):
+        return values if values.dtype == object else values.astype(np.int64, copy=False)
+    values = values if isinstance(values, list) else list(values)
+    try:
+        return np.array(values, dtype=np.int64)
+    except OverflowError:
+        return np.array(values, dtype=object)
+
+def sorted_snapshot(root: Node | None) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Chaves em ordem crescente e a profundidade de cada uma, como arrays int64
+    (as chaves em dtype object se a árvore tiver alguma fora de 64 bits).
+    Pode ser calculado uma vez e reaproveitado em várias chamadas de search_many.
+    """
+    import numpy as np
+
+    keys: list[int] = []
+    depths: list[int] = []
+    stack: list[tuple[Node, int]] = []
+    current, depth = root, 0
+    while stack or current is not None:
+        while current is not None:
+            stack.append((current, depth))
+            current, depth = current.left, depth + 1
+        node, depth = stack.pop()
+        keys.append(node.key)
+        depths.append(depth)
+        current, depth = node.right, depth + 1
+    return _key_array(keys), np.array(depths, dtype=np.int64)
+
+def search_many(
+    root: Node | None,
+    keys,
+    with_depth: bool = False,
+    with_path: bool = False,
+    snapshot: tuple["np.ndarray", "np.ndarray"] | None = None,
+) -> BatchLookup:
+    """
+    Consulta um lote de chaves (array NumPy ou qualquer iterável) de uma vez.
+    A pertinência sai de um searchsorted vetorizado sobre as chaves em ordem
+    (O(n + m log n)), sem objetos Python por chave. Profundidades vêm do
+    mesmo snapshot; os caminhos completos (search_node_ref) só são montados
+    se with_path=True.
+    """
+    import numpy as np
+
+    queries = _key_array(keys)
+    sorted_keys, key_depths = snapshot if snapshot is not None else sorted_snapshot(root)
+    if queries.dtype != sorted_keys.dtype:
+        # um dos lados tem chaves fora de int64: compara tudo como objeto
+        queries, sorted_keys = queries.astype(object), sorted_keys.astype(object)
+
+    if len(sorted_keys) == 0:
+        found = np.zeros(len(queries), dtype=bool)
+        depths = np.full(len(queries), -1, dtype=np.int64) if with_depth else None
+    else:
+        # posição além do fim aponta para a última chave, que então não bate
+        pos = np.minimum(np.searchsorted(sorted_keys, queries), len(sorted_keys) - 1)
+        found = (sorted_keys[pos] == queries).astype(bool, copy=False)
+        depths = np.where(found, key_depths[pos], -1) if with_depth else None
+    paths = [search_node_ref(root, int(k))[1] for k in queries] if with_path else None
+    return BatchLookup(found, depths, paths)
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#     Estatísticas de ordem: usam o tamanho de cada subárvore (node.size)
+#     para responder em O(altura) sem percorrer a árvore inteira.
+# ─────────────────────────────────────────────────────────────────────────── #
+def select(root: Node | None, k: int) -> int:
+    """Retorna a k-ésima menor chave (k começa em 0). IndexError se fora da faixa."""
+    if not 0 <= k < _size(root):
+        raise IndexError(f"posição {k} fora da árvore de {_size(root)} nós")
+    current = root
+    while True:
+        left_size = _size(current.left)
+        if k < left_size:
+            current = current.left
+        elif k == left_size:
+            return current.key
+        else:
+            k -= left_size + 1
+            current = current.right
+
+def _count_below(root: Node | None, key: int, inclusive: bool) -> int:
+    # nº de chaves < key (ou <= key, se inclusive)
+    count = 0
+    current = root
+    while current is not None:
+        if key > current.key or (inclusive and key == current.key):
+            count += _size(current.left) + 1
+            current = current.right
+        else:
+            current = current.left
+    return count
+
+def rank(root: Node | None, key: int) -> int:
+    """Quantidade de chaves estritamente menores que 'key' (posição em que ela estaria)."""
+    return _count_below(root, key, inclusive=False)
+
+def count_range(root: Node | None, lo: int, hi: int) -> int:
+    """Quantidade de chaves no intervalo fechado [lo, hi]."""
+    if lo > hi:
+        return 0
+    return _count_below(root, hi, inclusive=True) - _count_below(root, lo, inclusive=False)
+
+def _bound(root: Node | None, key: int, below: bool, strict: bool) -> int | None:
+    # maior chave abaixo de 'key' (below=True) ou menor acima; strict exclui a própria key
+    best = None
+    current = root
+    while current is not None:
+        if current.key == key and not strict:
+            return key
+        if below:
+            if current.key < key:
+                best = current.key
+                current = current.right
+            else:
+                current = current.left
+        else:
+            if current.key > key:
+                best = current.key
+                current = current.left
+            else:
+                current = current.right
+    return best
+
+def floor(root: Node | None, key: int) -> int | None:
+    """Maior chave <= key, ou None."""
+    return _bound(root, key, below=True, strict=False)
+
+def ceiling(root: Node | None, key: int) -> int | None:
+    """Menor chave >= key, ou None."""
+    return _bound(root, key, below=False, strict=False)
+
+def predecessor(root: Node | None, key: int) -> int | None:
+    """Maior chave < key, ou None."""
+    return _bound(root, key, below=True, strict=True)
+
+def successor(root: Node | None, key: int) -> int | None:
+    """Menor chave > key, ou None."""
+    return _bound(root, key, below=False, strict=True)
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#       Varredura preguiçosa de um intervalo [lo, hi] (crescente ou não)
+# ─────────────────────────────────────────────────────────────────────────── #
+def range_keys(root: Node | None, lo: int | None = None, hi: int | None = None, reverse: bool = False):
+    """
+    Gera, sob demanda, as chaves no intervalo fechado [lo, hi] (None = sem
+    limite), em ordem crescente ou decrescente (reverse=True). Desce direto
+    até o início do intervalo ignorando subárvores fora dele e para assim
+    que passa do fim: m chaves custam O(altura + m).
+    Ex.: as 50 primeiras chaves a partir de x -> islice(range_keys(r, lo=x), 50)
+    """
+    stack: list[Node] = []
+    current = root
+    while stack or current is not None:
+        while current is not None:
+            if not reverse:
+                if lo is not None and current.key < lo:
+                    current = current.right     # subárvore esquerda toda abaixo de lo
+                    continue
+                stack.append(current)
+                current = current.left
+            else:
+                if hi is not None and current.key > hi:
+                    current = current.left      # subárvore direita toda acima de hi
+                    continue
+                stack.append(current)
+                current = current.right
+        if not stack:
+            return
+        node = stack.pop()
+        if not reverse:
+            if hi is not None and node.key > hi:
+                return
+            current = node.right
+        else:
+            if lo is not None and node.key < lo:
+                return
+            current = node.left
+        yield node.key
@@ -0,0 +1,393 @@
+"""
+Formas somente leitura de guardar a árvore: colunas tipadas (ArrayTree),
+snapshot binário carregado via mmap e o layout de Eytzinger.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .traversal import inorder_keys
+from .tree import Node, _recompute_metadata
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#     Armazenamento compacto: chaves e filhos em colunas tipadas (array)
+# ─────────────────────────────────────────────────────────────────────────── #
+class ArrayTree:
+    """
+    Árvore somente leitura guardada em colunas paralelas:
+    keys (int64), left e right (int32, índice do filho ou -1) e
+    sizes (int32, nº de nós da subárvore).
+    Os nós ficam em pré-ordem, então a raiz é sempre o índice 0.
+    Cerca de 20 bytes por chave, contra ~72 de um Node (mais o int da chave).
+    """
+    __slots__ = ("keys", "left", "right", "sizes")
+
+    def __init__(self, keys, left, right, sizes):
+        self.keys = keys
+        self.left = left
+        self.right = right
+        self.sizes = sizes
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def root(self) -> "ArrayNode | None":
+        return ArrayNode(self, 0) if len(self.keys) else None
+
+    @classmethod
+    def from_root(cls, root) -> "ArrayTree":
+        keys, left, right = array("q"), array("i"), array("i")
+        stack = [(root, -1, False)] if root is not None else []
+        while stack:
+            node, parent, is_left = stack.pop()
+            index = len(keys)
+            keys.append(node.key)
+            left.append(-1)
+            right.append(-1)
+            if parent >= 0:
+                if is_left:
+                    left[parent] = index
+                else:
+                    right[parent] = index
+            if node.right is not None:
+                stack.append((node.right, index, False))
+            if node.left is not None:
+                stack.append((node.left, index, True))
+        # em pré-ordem os filhos têm índice maior: basta percorrer de trás pra frente
+        sizes = array("i", bytes(4 * len(keys)))
+        for index in range(len(keys) - 1, -1, -1):
+            l, r = left[index], right[index]
+            sizes[index] = 1 + (sizes[l] if l >= 0 else 0) + (sizes[r] if r >= 0 else 0)
+        return cls(keys, left, right, sizes)
+
+    def to_nodes(self) -> Node | None:
+        """Converte de volta para objetos Node (mutáveis)."""
+        nodes = [Node(k) for k in self.keys]
+        for node, l, r in zip(nodes, self.left, self.right):
+            if l >= 0:
+                node.left = nodes[l]
+            if r >= 0:
+                node.right = nodes[r]
+        if not nodes:
+            return None
+        _recompute_metadata(nodes[0])
+        return nodes[0]
+
+class ArrayNode:
+    """
+    Visão leve de um nó de ArrayTree com a mesma interface de Node
+    (key, left, right, size), para que search_node_ref, os percursos e
+    build_dot funcionem sem alteração sobre o armazenamento compacto.
+    """
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: ArrayTree, index: int):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def key(self) -> int:
+        return self.tree.keys[self.index]
+
+    @property
+    def size(self) -> int:
+        return self.tree.sizes[self.index]
+
+    @property
+    def left(self) -> "ArrayNode | None":
+        child = self.tree.left[self.index]
+        return ArrayNode(self.tree, child) if child >= 0 else None
+
+    @property
+    def right(self) -> "ArrayNode | None":
+        child = self.tree.right[self.index]
+        return ArrayNode(self.tree, child) if child >= 0 else None
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#   Snapshot binário: salva as colunas de ArrayTree e recarrega via mmap,
+#   sem cópia, como árvore somente leitura pronta para busca e percursos.
+# ─────────────────────────────────────────────────────────────────────────── #
+# Cabeçalho de 32 bytes: assinatura, nº de nós e espaço reservado.
+# Depois vêm as colunas, sempre little-endian: keys int64[n], left int32[n],
+# right int32[n], sizes int32[n] (mesmo layout em pré-ordem de ArrayTree).
+SNAPSHOT_MAGIC = b"BSTSNAP1"
+_SNAPSHOT_HEADER = struct.Struct("<8sQ16x")
+
+class SnapshotError(ValueError):
+    """Arquivo/buffer que não é um snapshot de árvore válido."""
+
+def write_snapshot(root: Node | None, fileobj) -> None:
+    """
+    Grava a árvore de 'root' em um arquivo binário já aberto ('wb').
+    SnapshotError se alguma chave não couber em int64.
+    """
+    try:
+        tree = ArrayTree.from_root(root)
+    except OverflowError:
+        raise SnapshotError("o snapshot guarda chaves em int64 e a árvore tem chaves fora desse intervalo") from None
+    columns = [tree.keys, tree.left, tree.right, tree.sizes]
+    if sys.byteorder != "little":
+        for column in columns:
+            column.byteswap()
+    fileobj.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(tree)))
+    for column in columns:
+        fileobj.write(column)
+
+def save_snapshot(root: Node | None, path: str) -> None:
+    with open(path, "wb") as f:
+        write_snapshot(root, f)
+
+def snapshot_from_buffer(buffer, verify: bool = True) -> ArrayTree:
+    """
+    Monta uma ArrayTree cujas colunas são fatias (memoryview) do próprio
+    buffer: bytes, bytearray ou mmap. Nada é copiado nem reconstruído. Com
+    verify=True (o padrão, para qualquer arquivo vindo de fora) as colunas
+    de filhos e tamanhos são conferidas por _check_layout; verify=False pula
+    a conferência e só vale para snapshots gravados por write_snapshot.
+    """
+    view = memoryview(buffer)
+    if len(view) < _SNAPSHOT_HEADER.size:
+        raise SnapshotError("arquivo curto demais para um snapshot")
+    magic, count = _SNAPSHOT_HEADER.unpack_from(view)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("assinatura de snapshot não reconhecida")
+    expected = _SNAPSHOT_HEADER.size + count * (8 + 4 + 4 + 4)
+    if len(view) != expected:
+        raise SnapshotError(f"tamanho inconsistente: {len(view)} bytes, esperado {expected}")
+
+    offset = _SNAPSHOT_HEADER.size
+    columns = []
+    for fmt, width in (("q", 8), ("i", 4), ("i", 4), ("i", 4)):
+        column = view[offset: offset + count * width].cast(fmt)
+        if sys.byteorder != "little":
+            # máquina big-endian: aqui não dá para evitar a cópia
+            column = array(fmt, column)
+            column.byteswap()
+        columns.append(column)
+        offset += count * width
+    if verify:
+        _check_layout(*columns[1:])
+    return ArrayTree(*columns)
+
+# nós conferidos por vez em _check_layout: limita os arrays temporários
+_CHECK_BLOCK = 1 << 20
+
+def _check_layout(left, right, sizes) -> None:
+    """
+    Confere que as colunas descrevem uma árvore em pré-ordem como a gravada
+    por write_snapshot: o filho esquerdo de i é i + 1, o direito vem logo
+    após a subárvore esquerda e sizes[i] = 1 + tamanhos dos filhos. Daí cada
+    subárvore ocupa um trecho contíguo [i, i + sizes[i]), todo índice é
+    maior que o do pai e menor que count, e nenhum nó tem dois pais: sem
+    laços nem IndexError nos percursos. Vetorizada com NumPy sobre as
+    próprias colunas (np.frombuffer, sem cópia), em blocos de _CHECK_BLOCK
+    nós; o erro aponta o primeiro nó inválido.
+    """
+    import numpy as np
+
+    count = len(sizes)
+    if not count:
+        return
+    left, right, sizes = (np.frombuffer(column, dtype=np.int32) for column in (left, right, sizes))
+    if sizes[0] != count:
+        raise SnapshotError(f"a raiz deveria cobrir {count} nós, cobre {sizes[0]}")
+    for start in range(0, count, _CHECK_BLOCK):
+        stop = min(start + _CHECK_BLOCK, count)
+        index = np.arange(start, stop)
+        l, r, size = left[start:stop], right[start:stop], sizes[start:stop]
+        has_left = (l != -1) & (l == index + 1) & (l < count)
+        left_ok = (l == -1) | has_left
+        left_size = np.where(has_left, sizes[np.where(has_left, l, 0)], 0)
+        has_right = (r != -1) & (r == index + 1 + left_size) & (r < count)
+        right_ok = (r == -1) | has_right
+        right_size = np.where(has_right, sizes[np.where(has_right, r, 0)], 0)
+        size_ok = size == 1 + left_size + right_size
+        bad = ~(left_ok & right_ok & size_ok)
+        if bad.any():
+            k = int(np.argmax(bad))
+            i = start + k
+            if not left_ok[k]:
+                raise SnapshotError(f"nó {i}: filho esquerdo {l[k]} fora da pré-ordem")
+            if not right_ok[k]:
+                raise SnapshotError(f"nó {i}: filho direito {r[k]} fora da pré-ordem")
+            raise SnapshotError(f"nó {i}: tamanho {size[k]} não bate com os filhos")
+
+def load_snapshot(path: str, verify: bool = True) -> ArrayTree:
+    """
+    Mapeia o arquivo em memória (mmap somente leitura) e devolve a ArrayTree
+    apoiada nele. A coluna de chaves só é lida do disco quando acessada; as
+    de filhos e tamanhos são lidas inteiras pela conferência, a menos que
+    verify=False (veja snapshot_from_buffer).
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise SnapshotError("arquivo vazio")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return snapshot_from_buffer(mapped, verify)
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#   Layout congelado de Eytzinger: chaves em ordem de largura (BFS) de uma
+#   árvore completa, num único array. Feito para cargas só de leitura.
+# ─────────────────────────────────────────────────────────────────────────── #
+class EytzingerTree:
+    """
+    Árvore somente leitura no layout de Eytzinger: keys (int64) guarda as
+    chaves em ordem de largura com base 1 (a posição 0 não é usada) e os
+    filhos de i ficam em 2i e 2i + 1, sem ponteiros. Os primeiros níveis,
+    visitados por toda busca, ficam juntos no começo do array, e cada passo
+    da descida cai em posição previsível: bem menos linhas de cache que
+    seguir referências entre objetos Node.
+    A forma passa a ser a da árvore completa com as mesmas chaves
+    (altura mínima), não a da árvore de origem.
+    """
+    __slots__ = ("keys", "sizes")
+
+    def __init__(self, keys, sizes):
+        self.keys = keys
+        self.sizes = sizes
+
+    def __len__(self) -> int:
+        return len(self.keys) - 1
+
+    @property
+    def root(self) -> "EytzingerNode | None":
+        return EytzingerNode(self, 1) if len(self) else None
+
+    @classmethod
+    def from_sorted(cls, sorted_keys) -> "EytzingerTree":
+        """Monta a partir de chaves já ordenadas e sem repetição, em O(n)."""
+        n = len(sorted_keys)
+        keys = array("q", bytes(8 * (n + 1)))
+        # in-order sobre os índices implícitos: a k-ésima posição visitada
+        # recebe a k-ésima menor chave
+        ordered = iter(sorted_keys)
+        stack, i = [], 1
+        while stack or i <= n:
+            while i <= n:
+                stack.append(i)
+                i *= 2
+            i = stack.pop()
+            keys[i] = next(ordered)
+            i = 2 * i + 1
+        sizes = array("i", bytes(4 * (n + 1)))
+        for i in range(n, 0, -1):
+            sizes[i] = 1 + (sizes[2 * i] if 2 * i <= n else 0) + (sizes[2 * i + 1] if 2 * i + 1 <= n else 0)
+        return cls(keys, sizes)
+
+    @classmethod
+    def from_root(cls, root) -> "EytzingerTree":
+        """Congela qualquer árvore (Node, ArrayNode, ...) com as mesmas chaves."""
+        return cls.from_sorted(array("q", inorder_keys(root)))
+
+    def to_nodes(self) -> Node | None:
+        """Converte para objetos Node (mutáveis) com a mesma forma."""
+        n = len(self)
+        nodes = [None] + [Node(self.keys[i]) for i in range(1, n + 1)]
+        for i in range(1, n // 2 + 1):
+            nodes[i].left = nodes[2 * i]
+            if 2 * i + 1 <= n:
+                nodes[i].right = nodes[2 * i + 1]
+        if not n:
+            return None
+        _recompute_metadata(nodes[1])
+        return nodes[1]
+
+    def search(self, key: int, start: int = 1) -> tuple[int, list[int]]:
+        """
+        Busca a partir do índice 'start' só com aritmética de índices.
+        Retorna (índice encontrado ou 0, chaves visitadas em ordem).
+        """
+        keys, n = self.keys, len(self)
+        visited_list: list[int] = []
+        i = start
+        while i <= n:
+            current = keys[i]
+            visited_list.append(current)
+            if key == current:
+                return i, visited_list
+            i = 2 * i + (key > current)
+        return 0, visited_list
+
+    def lower_bound(self, key: int) -> int:
+        """
+        Índice da menor chave >= key, ou 0. A descida não tem desvios: ao sair
+        da árvore, os bits 1 finais de i são as viradas à direita depois da
+        última à esquerda, e descartá-los (mais um) leva à resposta.
+        """
+        keys, n = self.keys, len(self)
+        i = 1
+        while i <= n:
+            i = 2 * i + (keys[i] < key)
+        return i >> ((~i & (i + 1)).bit_length())
+
+    def next_index(self, i: int) -> int:
+        """Índice da próxima chave em ordem crescente, ou 0 no fim."""
+        n = len(self)
+        if 2 * i + 1 <= n:
+            i = 2 * i + 1
+            while 2 * i <= n:
+                i *= 2
+            return i
+        while i & 1:        # sobe enquanto for filho direito (a raiz é ímpar)
+            i >>= 1
+        return i >> 1
+
+    def range_keys(self, lo: int, hi: int):
+        """Chaves em [lo, hi], crescentes: um lower_bound e depois sucessores."""
+        i = self.lower_bound(lo)
+        while i and self.keys[i] <= hi:
+            yield self.keys[i]
+            i = self.next_index(i)
+
+    def contains_many(self, keys) -> "np.ndarray":
+        """
+        Pertinência de um lote de chaves com NumPy: todas as buscas descem
+        juntas, um nível por passo, e terminam como em lower_bound.
+        """
+        import numpy as np
+
+        n = len(self)
+        queries = np.asarray(keys if isinstance(keys, (list, np.ndarray)) else list(keys), dtype=np.int64)
+        if n == 0:
+            return np.zeros(len(queries), dtype=bool)
+        table = np.frombuffer(self.keys, dtype=np.int64)
+        i = np.ones(len(queries), dtype=np.int64)
+        for _ in range(n.bit_length()):
+            inside = i <= n
+            i = np.where(inside, 2 * i + (table[np.where(inside, i, 1)] < queries), i)
+        i //= 2 * (~i & (i + 1))
+        return (i > 0) & (table[i] == queries)
+
+class EytzingerNode:
+    """Visão de um nó de EytzingerTree com a interface de Node (key, left, right, size)."""
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: EytzingerTree, index: int):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def key(self) -> int:
+        return self.tree.keys[self.index]
+
+    @property
+    def size(self) -> int:
+        return self.tree.sizes[self.index]
+
+    @property
+    def left(self) -> "EytzingerNode | None":
+        child = 2 * self.index
+        return EytzingerNode(self.tree, child) if child <= len(self.tree) else None
+
+    @property
+    def right(self) -> "EytzingerNode | None":
+        child = 2 * self.index + 1
+        return EytzingerNode(self.tree, child) if child <= len(self.tree) else None
+
+    def search_path(self, key: int) -> tuple["EytzingerNode | None", list[int]]:
+        """Mesmo retorno de search_node_ref, usando EytzingerTree.search."""
+        index, visited_list = self.tree.search(key, self.index)
+        return (EytzingerNode(self.tree, index) if index else None), visited_list
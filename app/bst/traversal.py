@@ -0,0 +1,56 @@
+"""Os quatro percursos como geradores de chaves."""
+from collections import deque
+
+from .tree import Node
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#            Funções geradoras dos quatro tipos de percurso (in-order etc)
+#     Todas usam pilha explícita: O(n) no total e sem limite de recursão.
+# ─────────────────────────────────────────────────────────────────────────── #
+def preorder_keys(root: Node | None):
+    stack = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        yield node.key
+        if node.right is not None:
+            stack.append(node.right)
+        if node.left is not None:
+            stack.append(node.left)
+
+def inorder_keys(root: Node | None):
+    stack: list[Node] = []
+    current = root
+    while stack or current is not None:
+        while current is not None:
+            stack.append(current)
+            current = current.left
+        node = stack.pop()
+        yield node.key
+        current = node.right
+
+def postorder_keys(root: Node | None):
+    # (nó, filhos_já_empilhados): não depende de identidade de objetos,
+    # então funciona também com as visões ArrayNode
+    stack = [(root, False)] if root is not None else []
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            yield node.key
+            continue
+        stack.append((node, True))
+        if node.right is not None:
+            stack.append((node.right, False))
+        if node.left is not None:
+            stack.append((node.left, False))
+
+def breadth_first_keys(root: Node | None):
+    if root is None:
+        return
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        yield node.key
+        if node.left:
+            queue.append(node.left)
+        if node.right:
+            queue.append(node.right)
@@ -0,0 +1,311 @@
+"""
+Nó da BST e operações que alteram a árvore: inserção e remoção (simples ou
+AVL, no lugar ou persistentes) e construção em lote.
+"""
+from .metrics import METRICS
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#                           Definição do nó da BST
+# ─────────────────────────────────────────────────────────────────────────── #
+class Node:
+    # __slots__ elimina o __dict__ por instância (bem menos memória por chave)
+    __slots__ = ("key", "left", "right", "height", "size")
+
+    def __init__(self, key: int):
+        self.key = key
+        self.left: "Node | None" = None
+        self.right: "Node | None" = None
+        self.height: int = 1  # altura da subárvore (usada no balanceamento AVL)
+        self.size: int = 1    # nº de nós da subárvore (estatísticas de ordem)
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#                 Modos de balanceamento e rotações (AVL)
+# ─────────────────────────────────────────────────────────────────────────── #
+BALANCE_NONE = "none"   # BST simples: a forma depende da ordem de inserção
+BALANCE_AVL = "avl"     # AVL: rotações mantêm a altura em O(log n)
+BALANCE_MODES = (BALANCE_NONE, BALANCE_AVL)
+
+def _height(node: Node | None) -> int:
+    return node.height if node is not None else 0
+
+def _size(node: Node | None) -> int:
+    return node.size if node is not None else 0
+
+def _update_node(node: Node) -> None:
+    # altura e tamanho dependem só dos filhos: O(1) por nó do caminho
+    node.height = 1 + max(_height(node.left), _height(node.right))
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+def _balance_factor(node: Node) -> int:
+    return _height(node.left) - _height(node.right)
+
+def _rotate_right(y: Node) -> Node:
+    x = y.left
+    y.left = x.right
+    x.right = y
+    _update_node(y)
+    _update_node(x)
+    return x
+
+def _rotate_left(x: Node) -> Node:
+    y = x.right
+    x.right = y.left
+    y.left = x
+    _update_node(x)
+    _update_node(y)
+    return y
+
+def _clone(node: Node) -> Node:
+    copy = Node(node.key)
+    copy.left = node.left
+    copy.right = node.right
+    copy.height = node.height
+    copy.size = node.size
+    return copy
+
+def _copy_path(path: list[Node]) -> list[Node]:
+    """
+    Copia os nós de um caminho raiz -> nó e religa cada cópia à cópia do
+    filho seguinte. O resto da árvore continua compartilhado (path copying).
+    """
+    copies = [_clone(node) for node in path]
+    for i in range(len(path) - 1):
+        if copies[i].left is path[i + 1]:
+            copies[i].left = copies[i + 1]
+        else:
+            copies[i].right = copies[i + 1]
+    return copies
+
+def _rebalance(node: Node, persistent: bool = False) -> Node:
+    """
+    Atualiza a altura de 'node' e aplica as rotações AVL (simples ou duplas)
+    caso o fator de balanceamento saia do intervalo [-1, 1].
+    Em modo persistente, os filhos que a rotação altera são copiados antes
+    (na remoção eles podem estar fora do caminho já copiado).
+    Retorna a nova raiz da subárvore.
+    """
+    _update_node(node)
+    bf = _balance_factor(node)
+    if bf > 1:
+        if persistent:
+            node.left = _clone(node.left)
+        if _balance_factor(node.left) < 0:      # caso esquerda-direita
+            if persistent:
+                node.left.right = _clone(node.left.right)
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if bf < -1:
+        if persistent:
+            node.right = _clone(node.right)
+        if _balance_factor(node.right) > 0:     # caso direita-esquerda
+            if persistent:
+                node.right.left = _clone(node.right.left)
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
+
+def _fix_subtree(node: Node, balance: str, persistent: bool = False) -> Node:
+    # Em modo AVL rebalanceia; no modo simples só mantém altura/tamanho atualizados
+    if balance == BALANCE_AVL:
+        return _rebalance(node, persistent)
+    _update_node(node)
+    return node
+
+def _recompute_metadata(root: Node | None) -> None:
+    """
+    Recalcula altura e tamanho de todos os nós (pós-ordem iterativa). Usado quando a
+    árvore é montada sem passar por bst_insert (ex.: a partir de DOT).
+    """
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if node is None:
+            continue
+        if children_done:
+            _update_node(node)
+        else:
+            stack.append((node, True))
+            stack.append((node.left, False))
+            stack.append((node.right, False))
+
+def _retrace(path: list[Node], balance: str, persistent: bool = False) -> Node:
+    """
+    Sobe pelo caminho percorrido (do nó mais fundo até a raiz) atualizando
+    altura e tamanho e, em modo AVL, aplicando rotações. Cada subárvore possivelmente
+    rotacionada é religada ao seu pai. Retorna a raiz resultante.
+    """
+    subtree = path[-1]
+    for i in range(len(path) - 1, -1, -1):
+        node = path[i]
+        subtree = _fix_subtree(node, balance, persistent)
+        if i > 0 and subtree is not node:
+            parent = path[i - 1]
+            if parent.left is node:
+                parent.left = subtree
+            else:
+                parent.right = subtree
+    return subtree
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#              Função tradicional para inserir na BST (in-order de antes)
+# ─────────────────────────────────────────────────────────────────────────── #
+def bst_insert(root: Node | None, key: int, balance: str = BALANCE_NONE, persistent: bool = False) -> Node:
+    """
+    Inserção iterativa: desce guardando o caminho em uma pilha explícita e
+    depois sobe por ela (_retrace), sem recursão, independente da profundidade.
+    Com persistent=True a árvore original não é tocada: só o caminho é
+    copiado (O(altura) nós novos) e a nova raiz compartilha o resto.
+    """
+    if root is None:
+        return Node(key)
+    path: list[Node] = []
+    current = root
+    while current is not None:
+        if key == current.key:
+            # se igual, não insere (evita duplicados)
+            return root
+        path.append(current)
+        current = current.left if key < current.key else current.right
+    if METRICS.enabled:
+        METRICS.count("insert.node_visits", len(path))
+        METRICS.count("nodes.allocated", 1 + (len(path) if persistent else 0))
+    if persistent:
+        path = _copy_path(path)
+    parent = path[-1]
+    if key < parent.key:
+        parent.left = Node(key)
+    else:
+        parent.right = Node(key)
+    return _retrace(path, balance, persistent)
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#                       Remoção de uma chave da BST
+# ─────────────────────────────────────────────────────────────────────────── #
+def bst_delete(
+    root: Node | None, key: int, balance: str = BALANCE_NONE, persistent: bool = False
+) -> Node | None:
+    """
+    Remove 'key' da árvore (se existir) e retorna a nova raiz.
+    Nó com dois filhos recebe a chave do sucessor (menor da subárvore direita),
+    e o sucessor é que sai da árvore. Em modo AVL, rebalanceia no caminho de volta.
+    Com persistent=True, como em bst_insert, só o caminho é copiado.
+    """
+    path: list[Node] = []
+    current = root
+    while current is not None and current.key != key:
+        path.append(current)
+        current = current.left if key < current.key else current.right
+    if current is None:
+        return root
+
+    target = current
+    found_at = len(path)
+    if current.left is not None and current.right is not None:
+        path.append(current)
+        target = current.right
+        while target.left is not None:
+            path.append(target)
+            target = target.left
+
+    replacement = target.left if target.left is not None else target.right
+    if not path:
+        return replacement
+    if METRICS.enabled:
+        METRICS.count("delete.node_visits", len(path) + 1)
+        METRICS.count("nodes.allocated", len(path) if persistent else 0)
+    if persistent:
+        path = _copy_path(path)
+    if target is not current:
+        path[found_at].key = target.key
+    parent = path[-1]
+    if parent.left is target:
+        parent.left = replacement
+    else:
+        parent.right = replacement
+    return _retrace(path, balance, persistent)
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#        Construção em lote: a partir de uma lista de chaves de uma só vez
+# ─────────────────────────────────────────────────────────────────────────── #
+def _build_balanced(sorted_keys: list[int]) -> Node | None:
+    """
+    Monta uma árvore perfeitamente balanceada a partir de chaves já ordenadas
+    e sem repetição, em O(n). Cada faixa [lo, hi) vira um nó com a chave do
+    meio; uma faixa de tamanho m tem altura m.bit_length() e tamanho m.
+    """
+    if not sorted_keys:
+        return None
+    lo, hi = 0, len(sorted_keys)
+    mid = (lo + hi) // 2
+    root = Node(sorted_keys[mid])
+    root.height = (hi - lo).bit_length()
+    root.size = hi - lo
+    # pilha de (nó, início, fim) ainda sem filhos montados
+    stack = [(root, lo, hi)]
+    while stack:
+        node, lo, hi = stack.pop()
+        mid = (lo + hi) // 2
+        if lo < mid:
+            child_mid = (lo + mid) // 2
+            node.left = Node(sorted_keys[child_mid])
+            node.left.height = (mid - lo).bit_length()
+            node.left.size = mid - lo
+            stack.append((node.left, lo, mid))
+        if mid + 1 < hi:
+            child_mid = (mid + 1 + hi) // 2
+            node.right = Node(sorted_keys[child_mid])
+            node.right.height = (hi - mid - 1).bit_length()
+            node.right.size = hi - mid - 1
+            stack.append((node.right, mid + 1, hi))
+    return root
+
+def _build_insertion_shape(keys: list[int]) -> Node | None:
+    """
+    Reproduz exatamente a forma que inserções sucessivas (BST simples) gerariam.
+    Essa árvore é a árvore cartesiana das chaves ordenadas, usando como
+    prioridade a posição da primeira ocorrência de cada chave na entrada:
+    após a ordenação, a montagem com pilha é linear.
+    """
+    first_pos: dict[int, int] = {}
+    for pos, key in enumerate(keys):
+        first_pos.setdefault(key, pos)
+
+    stack: list[Node] = []      # espinha direita da árvore montada até agora
+    for key in sorted(first_pos):
+        node = Node(key)
+        last_popped: Node | None = None
+        while stack and first_pos[stack[-1].key] > first_pos[key]:
+            last_popped = stack.pop()
+        node.left = last_popped
+        if stack:
+            stack[-1].right = node
+        stack.append(node)
+
+    if not stack:
+        return None
+    root = stack[0]
+    _recompute_metadata(root)
+    return root
+
+def bst_build(keys, balance: str = BALANCE_NONE, insertion_shape: bool = False) -> Node | None:
+    """
+    Constrói a árvore a partir de uma sequência de chaves (duplicadas ignoradas).
+    - insertion_shape=False: ordena/deduplica uma vez e monta a árvore
+      perfeitamente balanceada (válida também como AVL).
+    - insertion_shape=True: mesma forma de chamar bst_insert para cada chave,
+      na ordem recebida (útil para fins didáticos).
+    """
+    keys = list(keys)
+    if not insertion_shape:
+        root = _build_balanced(sorted(set(keys)))
+        METRICS.count("nodes.allocated", _size(root))
+        return root
+    if balance == BALANCE_NONE:
+        root = _build_insertion_shape(keys)
+        METRICS.count("nodes.allocated", _size(root))
+        return root
+    # No modo AVL a forma depende das rotações: inserimos um a um
+    root = None
+    for key in keys:
+        root = bst_insert(root, key, balance)
+    return root
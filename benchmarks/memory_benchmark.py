@@ -0,0 +1,41 @@
+"""
+Compara a memória ocupada por uma árvore de objetos Node (com __slots__)
+e pela mesma árvore em colunas tipadas (ArrayTree).
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.memory_benchmark 1000000
+"""
+import random
+import sys
+import tracemalloc
+
+from app.bst import ArrayTree, bst_build, inorder_keys, search_node_ref
+
+
+def measure(build):
+    """Executa build() e retorna (resultado, bytes retidos ao final)."""
+    tracemalloc.start()
+    result = build()
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained
+
+
+def main(n: int) -> None:
+    keys = random.sample(range(n * 10), n)
+
+    root, node_bytes = measure(lambda: bst_build(keys))
+    compact, array_bytes = measure(lambda: ArrayTree.from_root(root))
+
+    # sanidade: mesma árvore vista pelas duas representações
+    assert next(inorder_keys(root)) == next(inorder_keys(compact.root))
+    assert search_node_ref(root, keys[0])[1] == search_node_ref(compact.root, keys[0])[1]
+
+    print(f"chaves: {n}")
+    print(f"Node (__slots__): {node_bytes / 2**20:10.1f} MiB  ({node_bytes / n:6.1f} B/chave)")
+    print(f"ArrayTree:        {array_bytes / 2**20:10.1f} MiB  ({array_bytes / n:6.1f} B/chave)")
+    print("(os objetos int das chaves são compartilhados com a lista de entrada no caso Node)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
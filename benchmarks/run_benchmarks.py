@@ -0,0 +1,254 @@
+"""
+Benchmarks dos caminhos quentes da BST: construção (bst_insert / bst_build),
+busca (search_node_ref, acerto e falha, também no layout de Eytzinger), os
+quatro percursos, leitura de DOT (parse_dot_stream), geração do grafo
+(build_dot) e as versões paralelas (parallel_build, parallel_traversal e
+parallel_search).
+
+Para cada tamanho n mede tempo, vazão (operações/s), pico de memória
+(tracemalloc, em uma segunda execução para não distorcer o tempo) e altura
+da árvore, e grava tudo em JSON para comparar versões.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.run_benchmarks                       # n = 10^3 .. 10^5
+    python -m benchmarks.run_benchmarks --max-exp 7           # até 10^7
+    python -m benchmarks.run_benchmarks --workers 8           # processos dos casos paralelos
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/anterior.json
+"""
+import argparse
+import datetime
+import io
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.bst import (
+    BALANCE_AVL,
+    BALANCE_NONE,
+    EytzingerTree,
+    breadth_first_keys,
+    bst_build,
+    bst_insert,
+    build_dot,
+    inorder_keys,
+    parallel_build,
+    parallel_search,
+    parallel_traversal,
+    parse_dot_stream,
+    postorder_keys,
+    preorder_keys,
+    search_node_ref,
+)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SEARCH_QUERIES = 100_000     # buscas por caso (limitado a n)
+QUADRATIC_LIMIT = 5_000      # inserção simples de chaves ordenadas é O(n²): acima disso, pula
+BUILD_DOT_LIMIT = 200_000    # build_dot monta o Digraph inteiro em memória
+
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#                          Geração das entradas
+# ─────────────────────────────────────────────────────────────────────────── #
+def keys_random(n: int) -> list[int]:
+    return random.sample(range(n * 4), n)
+
+def keys_sorted(n: int) -> list[int]:
+    return list(range(n))
+
+def keys_zigzag(n: int) -> list[int]:
+    # menor, maior, segunda menor, segunda maior...: também degenera a BST simples
+    low, high, keys = 0, n - 1, []
+    while low <= high:
+        keys.append(low)
+        if low != high:
+            keys.append(high)
+        low, high = low + 1, high - 1
+    return keys
+
+INPUTS = {"random": keys_random, "sorted": keys_sorted, "zigzag": keys_zigzag}
+
+def sample_misses(keys: list[int], limit: int, count: int) -> list[int]:
+    """
+    'count' chaves ausentes em [0, limit), espalhadas pela faixa das chaves
+    para percorrer caminhos reais. Sorteio com rejeição: com 3/4 da faixa
+    livre, poucas tentativas bastam e só o conjunto das chaves é montado.
+    """
+    present = set(keys)
+    chosen: set[int] = set()
+    misses: list[int] = []          # na ordem sorteada, não na ordem do set
+    while len(misses) < count:
+        candidate = random.randrange(limit)
+        if candidate not in present and candidate not in chosen:
+            chosen.add(candidate)
+            misses.append(candidate)
+    return misses
+
+def insert_all(keys: list[int], balance: str):
+    root = None
+    for key in keys:
+        root = bst_insert(root, key, balance)
+    return root
+
+def tree_to_dot(root) -> str:
+    """Texto DOT no mesmo formato que o app aceita (node<k> + arestas esq/dir)."""
+    out = io.StringIO()
+    out.write("digraph g {\n  node [shape = record,height=.1];\n")
+    for key in preorder_keys(root):
+        out.write(f'  node{key}[label = "<esq> | {key} | <dir> "]\n')
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for port, child in (("esq", node.left), ("dir", node.right)):
+            if child is not None:
+                out.write(f'  "node{node.key}":{port} -> "node{child.key}"\n')
+                stack.append(child)
+    out.write("}\n")
+    return out.getvalue()
+
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#                               Medição
+# ─────────────────────────────────────────────────────────────────────────── #
+def measure(fn, ops: int, memory: bool) -> dict:
+    # casos rápidos são repetidos (melhor de até 5) para reduzir o ruído
+    seconds, spent, runs = float("inf"), 0.0, 0
+    while runs == 0 or (spent < 0.2 and runs < 5):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        seconds, spent, runs = min(seconds, elapsed), spent + elapsed, runs + 1
+    record = {"seconds": seconds, "ops": ops, "ops_per_sec": ops / seconds if seconds else None}
+    if memory:
+        del result
+        tracemalloc.start()
+        result = fn()
+        record["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    record["_result"] = result
+    return record
+
+def run_size(n: int, memory: bool, workers: int | None = None) -> list[dict]:
+    records = []
+
+    def add(case: str, fn, ops: int, **extra):
+        record = measure(fn, ops, memory)
+        result = record.pop("_result")
+        if "height_of" in extra:
+            tree = extra.pop("height_of")(result)
+            record["height"] = tree.height if tree is not None else 0
+        record.update({"case": case, "n": n, **extra})
+        records.append(record)
+        print(f"  {case:<28} {record['seconds']:9.4f}s  {record['ops_per_sec'] or 0:14,.0f} op/s"
+              + (f"  pico {record['peak_bytes'] / 2**20:8.1f} MiB" if "peak_bytes" in record else "")
+              + (f"  altura {record['height']}" if "height" in record else ""))
+        return result
+
+    for name, make_keys in INPUTS.items():
+        keys = make_keys(n)
+        for balance in (BALANCE_NONE, BALANCE_AVL):
+            if balance == BALANCE_NONE and name != "random" and n > QUADRATIC_LIMIT:
+                records.append({"case": f"insert/{name}/{balance}", "n": n, "skipped": "O(n²)"})
+                continue
+            add(f"insert/{name}/{balance}", lambda: insert_all(keys, balance), n, height_of=lambda r: r)
+        add(f"bulk_build/{name}", lambda: bst_build(keys), n, height_of=lambda r: r)
+
+    keys = keys_random(n)
+    root = bst_build(keys, insertion_shape=True)
+    queries = min(n, SEARCH_QUERIES)
+    hits = random.sample(keys, queries)
+    misses = sample_misses(keys, n * 4, queries)
+    add("search/hit", lambda: [search_node_ref(root, k) for k in hits], queries)
+    add("search/miss", lambda: [search_node_ref(root, k) for k in misses], queries)
+
+    frozen = EytzingerTree.from_root(root).root
+    add("search/eytzinger/hit", lambda: [search_node_ref(frozen, k) for k in hits], queries)
+    add("search/eytzinger/miss", lambda: [search_node_ref(frozen, k) for k in misses], queries)
+    add("search/eytzinger/batch", lambda: frozen.tree.contains_many(hits + misses), 2 * queries)
+
+    for traversal in (preorder_keys, inorder_keys, postorder_keys, breadth_first_keys):
+        add(f"traversal/{traversal.__name__}", lambda: sum(1 for _ in traversal(root)), n)
+
+    # abaixo de PARALLEL_MIN_NODES estas funções rodam sequencialmente
+    add("parallel/build", lambda: parallel_build(keys, workers), n)
+    for order in ("inorder", "breadth_first"):
+        add(f"parallel/{order}", lambda: len(parallel_traversal(root, order, workers)), n)
+    add("parallel/search", lambda: parallel_search(root, hits + misses, workers), 2 * queries)
+
+    dot_text = tree_to_dot(root)
+    add("parse_dot_stream", lambda: parse_dot_stream(io.StringIO(dot_text)), n, height_of=lambda r: r)
+
+    if n <= BUILD_DOT_LIMIT:
+        visited = set(hits[:100])
+        add("build_dot", lambda: build_dot(root, visited).source, n)
+    else:
+        records.append({"case": "build_dot", "n": n, "skipped": f"n > {BUILD_DOT_LIMIT}"})
+    return records
+
+
+# ─────────────────────────────────────────────────────────────────────────── #
+#                       Gravação e comparação em JSON
+# ─────────────────────────────────────────────────────────────────────────── #
+def git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+def compare(current: list[dict], previous_path: Path, tolerance: float) -> int:
+    previous = {(r["case"], r["n"]): r for r in json.loads(previous_path.read_text())["results"]}
+    regressions = 0
+    print(f"\nComparação com {previous_path} (tolerância {tolerance:.0%}):")
+    for record in current:
+        old = previous.get((record["case"], record["n"]))
+        if old is None or "seconds" not in record or "seconds" not in old:
+            continue
+        ratio = record["seconds"] / old["seconds"]
+        flag = "REGRESSÃO" if ratio > 1 + tolerance else ""
+        regressions += bool(flag)
+        print(f"  {record['case']:<28} n={record['n']:<9} {ratio:6.2f}x  {flag}")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-exp", type=int, default=3, help="menor n = 10^min-exp (padrão 3)")
+    parser.add_argument("--max-exp", type=int, default=5, help="maior n = 10^max-exp (padrão 5, até 7)")
+    parser.add_argument("--no-memory", action="store_true", help="não medir pico de memória (mais rápido)")
+    parser.add_argument("--output", type=Path, help="arquivo JSON de saída (padrão: results/<data>.json)")
+    parser.add_argument("--compare", type=Path, help="JSON anterior para apontar regressões")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="folga antes de acusar regressão")
+    parser.add_argument("--workers", type=int, help="processos dos casos paralelos (padrão: nº de CPUs)")
+    parser.add_argument("--seed", type=int, default=12345)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    results = []
+    for exp in range(args.min_exp, args.max_exp + 1):
+        print(f"n = 10^{exp}")
+        results.extend(run_size(10 ** exp, memory=not args.no_memory, workers=args.workers))
+
+    output = args.output or RESULTS_DIR / f"{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "workers": args.workers,
+        "results": results,
+    }, indent=2))
+    print(f"\nResultados gravados em {output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
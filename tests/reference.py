@@ -0,0 +1,103 @@
+"""Implementações ingênuas (recursivas, sem otimização) usadas como referência nos testes."""
+import bisect
+
+
+def naive_shape(keys):
+    """Forma (chave, esq, dir) gerada por inserções sucessivas numa BST simples."""
+    tree = None
+
+    def insert(node, key):
+        if node is None:
+            return (key, None, None)
+        k, left, right = node
+        if key < k:
+            return (k, insert(left, key), right)
+        if key > k:
+            return (k, left, insert(right, key))
+        return node
+
+    for key in keys:
+        tree = insert(tree, key)
+    return tree
+
+
+def shape(node):
+    """Forma (chave, esq, dir) de qualquer árvore com key/left/right."""
+    if node is None:
+        return None
+    return (node.key, shape(node.left), shape(node.right))
+
+
+def naive_path(tree_shape, key):
+    path, node = [], tree_shape
+    while node is not None:
+        path.append(node[0])
+        if key == node[0]:
+            break
+        node = node[1] if key < node[0] else node[2]
+    return path
+
+
+def check_invariants(root, avl=False):
+    """Ordem da BST, size e height corretos em cada nó e, se avl, fator de balanço."""
+
+    def walk(node, lo, hi):
+        if node is None:
+            return 0, 0
+        assert (lo is None or node.key > lo) and (hi is None or node.key < hi), "ordem da BST"
+        left_height, left_size = walk(node.left, lo, node.key)
+        right_height, right_size = walk(node.right, node.key, hi)
+        assert node.size == 1 + left_size + right_size, f"size errado em {node.key}"
+        assert node.height == 1 + max(left_height, right_height), f"height errado em {node.key}"
+        if avl:
+            assert abs(left_height - right_height) <= 1, f"desbalanceado em {node.key}"
+        return node.height, node.size
+
+    walk(root, None, None)
+
+
+class SortedKeys:
+    """Estatísticas de ordem sobre uma lista ordenada (bisect)."""
+
+    def __init__(self, keys):
+        self.keys = sorted(set(keys))
+
+    def rank(self, key):
+        return bisect.bisect_left(self.keys, key)
+
+    def count_range(self, lo, hi):
+        return max(0, bisect.bisect_right(self.keys, hi) - bisect.bisect_left(self.keys, lo))
+
+    def floor(self, key):
+        i = bisect.bisect_right(self.keys, key)
+        return self.keys[i - 1] if i else None
+
+    def ceiling(self, key):
+        i = bisect.bisect_left(self.keys, key)
+        return self.keys[i] if i < len(self.keys) else None
+
+    def predecessor(self, key):
+        i = bisect.bisect_left(self.keys, key)
+        return self.keys[i - 1] if i else None
+
+    def successor(self, key):
+        i = bisect.bisect_right(self.keys, key)
+        return self.keys[i] if i < len(self.keys) else None
+
+    def range(self, lo, hi):
+        return [k for k in self.keys if (lo is None or k >= lo) and (hi is None or k <= hi)]
+
+
+def dot_text(root):
+    """Texto DOT no formato aceito pelo app (node<k> + arestas esq/dir)."""
+    lines = ["digraph g {", "  node [shape = record,height=.1];"]
+    stack = [root] if root is not None else []
+    edges = []
+    while stack:
+        node = stack.pop()
+        lines.append(f'  node{node.key}[label = "<esq> | {node.key} | <dir> "]')
+        for port, child in (("esq", node.left), ("dir", node.right)):
+            if child is not None:
+                edges.append(f'  "node{node.key}":{port} -> "node{child.key}"')
+                stack.append(child)
+    return "\n".join(lines + edges + ["}"]) + "\n"
@@ -0,0 +1,164 @@
+"""
+Teste de fumaça da interface: constrói a árvore padrão e clica em cada botão
+do app (barra lateral e tela principal), conferindo que nenhum deles quebra
+o script (por ex. um nome que deixou de ser importado do pacote bst).
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+st_testing = pytest.importorskip("streamlit.testing.v1")
+
+APP = str(Path(__file__).resolve().parents[1] / "app" / "app.py")
+
+
+def _run(at):
+    at.run()
+    assert not at.exception, [e.value for e in at.exception]
+    return at
+
+
+def _fill_inputs(at):
+    values = {
+        "chave a buscar": "45",
+        "Busca em lote": "10,45,99",
+        "inserir/remover": "99",
+    }
+    for widget in at.text_input:
+        for label, value in values.items():
+            if label in widget.label:
+                widget.input(value)
+
+
+def _built_app():
+    at = _run(st_testing.AppTest.from_file(APP, default_timeout=30))
+    _fill_inputs(at)
+    next(b for b in at.button if "Construir (Valores)" in b.label).click()
+    return _run(at)
+
+
+def test_every_button_runs_without_exception():
+    labels = [b.label for b in _built_app().button]
+    assert any("Buscar Lote" in label for label in labels)
+    # um app novo por botão: um erro tratado (st.stop) esconderia os botões seguintes
+    for label in labels:
+        at = _built_app()
+        button = next(b for b in at.button if b.label == label)
+        if button.disabled:
+            continue
+        button.click()
+        _run(at)
+
+
+def test_search_then_traversal_prepare_sequences():
+    at = _built_app()
+    next(b for b in at.button if "Iniciar Busca" in b.label).click()
+    _run(at)
+    assert at.session_state["sequence"] == [50, 30, 40, 45]
+    next(b for b in at.button if "Preparar Caminhamento" in b.label).click()
+    _run(at)
+    assert len(at.session_state["sequence"]) == 11
+
+
+def test_step_controls_after_search():
+    at = _built_app()
+    next(b for b in at.button if "Iniciar Busca" in b.label).click()
+    _run(at)
+    for label in ("Avançar 1x", "Avançar 1x", "Voltar 1x", "Rodar Tudo", "Pausar"):
+        next(b for b in at.button if label in b.label).click()
+        _run(at)
+    assert at.session_state["current_index"] >= 0
+
+
+def test_keys_outside_int64_report_an_error_in_read_only_storage():
+    for storage in ("compacto", "eytzinger"):
+        at = _run(st_testing.AppTest.from_file(APP, default_timeout=30))
+        next(s for s in at.selectbox if "Armazenamento" in s.label).select(storage)
+        next(t for t in at.text_input if "Valores" in t.label).input("50,30,99999999999999999999")
+        next(b for b in at.button if "Construir (Valores)" in b.label).click()
+        _run(at)
+        assert any("64 bits" in e.value for e in at.sidebar.error)
+        assert at.session_state["root"] is None
+
+
+def test_snapshot_of_keys_outside_int64_reports_an_error():
+    at = _run(st_testing.AppTest.from_file(APP, default_timeout=30))
+    next(t for t in at.text_input if "Valores" in t.label).input("50,30,99999999999999999999")
+    next(b for b in at.button if "Construir (Valores)" in b.label).click()
+    _run(at)
+    next(b for b in at.button if "Preparar snapshot" in b.label).click()
+    _run(at)
+    assert any("int64" in e.value for e in at.sidebar.error)
+
+
+def test_playback_ticks_send_only_the_step_css(monkeypatch):
+    at = _run(st_testing.AppTest.from_file(APP, default_timeout=30))
+    # sem o executável do Graphviz não há SVG; um layout fixo basta aqui
+    # (árvore própria, para não pegar um layout já guardado por outro teste)
+    monkeypatch.setattr(sys.modules["bst"], "tree_layout_svg", lambda root: "<svg>arvore</svg>")
+    next(t for t in at.text_input if "Valores" in t.label).input("8,4,12")
+    next(b for b in at.button if "Construir (Valores)" in b.label).click()
+    next(t for t in at.text_input if "chave a buscar" in t.label).input("12")
+    _run(at)
+    next(b for b in at.button if "Iniciar Busca" in b.label).click()
+    _run(at)
+    next(b for b in at.button if "Avançar 1x" in b.label).click()
+    _run(at)
+    bodies = [h.proto.body for h in at.get("html")]
+    assert bodies.count("<svg>arvore</svg>") == 1
+    assert [b for b in bodies if b.startswith("<style>")] == ["<style>#bst-n8 ellipse { fill: lightblue; }</style>"]
+    assert any("Índice atual: `0`" in c.value for c in at.caption)
+
+
+@pytest.mark.parametrize("values, batch", [
+    ("50,30,99999999999999999999", "30,99999999999999999999"),     # chave grande na árvore
+    (None, "30,99999999999999999999"),                             # só na consulta (árvore padrão)
+])
+def test_batch_search_with_keys_outside_int64(values, batch):
+    at = _run(st_testing.AppTest.from_file(APP, default_timeout=30))
+    if values is not None:
+        next(t for t in at.text_input if "Valores" in t.label).input(values)
+    next(b for b in at.button if "Construir (Valores)" in b.label).click()
+    _run(at)
+    next(t for t in at.text_input if "Busca em lote" in t.label).input(batch)
+    next(b for b in at.button if "Buscar Lote" in b.label).click()
+    _run(at)
+    found = 2 if values is not None else 1
+    assert any(f"{found} de 2 chaves" in i.value for i in at.sidebar.info)
+
+
+def test_undo_button_tracks_the_version_history():
+    at = _built_app()
+
+    def undo():
+        return next(b for b in at.button if "Desfazer" in b.label)
+
+    assert undo().disabled
+    next(b for b in at.button if "Inserir" in b.label).click()
+    _run(at)
+    assert not undo().disabled          # habilitado logo após a primeira edição
+    assert at.session_state["root"].size == 12
+    undo().click()
+    _run(at)
+    assert undo().disabled              # de volta à versão 0
+    assert len(at.session_state["versions"]) == 1
+    assert at.session_state["root"].size == 11
+
+
+def test_metrics_controls_need_the_admin_setting(monkeypatch):
+    monkeypatch.delenv("BST_METRICS_ADMIN", raising=False)
+    at = _built_app()
+    assert not [t for t in at.toggle if "Instrumentação" in t.label]
+
+    monkeypatch.setenv("BST_METRICS_ADMIN", "1")
+    at = _built_app()
+    toggle = next(t for t in at.toggle if "Instrumentação" in t.label)
+    toggle.set_value(True)
+    _run(at)
+    try:
+        assert any("Zerar métricas" in b.label for b in at.button)
+    finally:
+        # as métricas são do processo: desliga para não afetar os outros testes
+        next(t for t in at.toggle if "Instrumentação" in t.label).set_value(False)
+        _run(at)
@@ -0,0 +1,19 @@
+from app.bst import TreeCache, bst_build, bst_insert
+
+
+def test_derived_values_are_shared_per_root():
+    cache = TreeCache(max_derived=2)
+    calls = []
+
+    def layout(root):
+        return cache.derived(root, "layout_svg", lambda: calls.append(root) or f"svg{root.size}")
+
+    root = cache.get_or_build(TreeCache.key_for("valores", [2, 1, 3]), lambda: bst_build([2, 1, 3]))
+    assert layout(root) == layout(root) == "svg3"          # segunda sessão com a mesma raiz
+    edited = bst_insert(root, 4, persistent=True)
+    assert layout(edited) == "svg4"
+    assert len(calls) == 2
+    layout(bst_build([5]))                                 # terceira raiz: sai a mais antiga
+    assert cache.stats()["derived"] == 2
+    layout(root)
+    assert len(calls) == 4
@@ -0,0 +1,45 @@
+import io
+import random
+
+import pytest
+
+from app.bst import DotParseError, bst_build, parse_dot_stream, parse_dot_to_bst
+from reference import check_invariants, dot_text, shape
+
+
+@pytest.mark.parametrize("n", [1, 2, 50, 400])
+def test_round_trip_keeps_shape_and_metadata(n):
+    root = bst_build(random.Random(n).sample(range(5_000), n), insertion_shape=True)
+    text = dot_text(root)
+    for source in (io.StringIO(text), io.BytesIO(text.encode())):
+        parsed = parse_dot_stream(source)
+        assert shape(parsed) == shape(root)
+        check_invariants(parsed)
+
+
+def test_accepts_unquoted_edges_and_repeated_edges():
+    parsed = parse_dot_to_bst("node5:esq->node3\nnode5:dir -> node8\n\"node5\":esq -> \"node3\"\n")
+    assert shape(parsed) == (5, (3, None, None), (8, None, None))
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "nenhum nó"),
+    ('"node5":esq -> "node7"', "à esquerda"),
+    ('"node5":dir -> "node2"', "à direita"),
+    ('"node5":esq -> "node3"\n"node5":esq -> "node2"', "já tem filho"),
+    ('"node5":esq -> "node3"\n"node1":dir -> "node3"', "mais de um pai"),
+    ("node1[label=a]\nnode2[label=b]", "exatamente uma raiz"),
+    ('node9[label=a]\n"node5":esq -> "node3"\n"node3":dir -> "node4"\n"node4":esq -> "node3"', "mais de um pai"),
+    ('"node10":esq -> "node5"\n"node5":dir -> "node20"', "viola a ordem"),
+])
+def test_invalid_graphs_raise_with_a_reason(text, message):
+    with pytest.raises(DotParseError, match=message):
+        parse_dot_stream(io.StringIO(text))
+    assert parse_dot_to_bst(text) is None
+
+
+def test_cycle_detached_from_the_root_is_rejected():
+    # 1 -> 2 é a árvore; 10 <-> 8 formam um ciclo sem raiz própria
+    text = '"node1":dir -> "node2"\n"node10":esq -> "node8"\n"node8":dir -> "node10"'
+    with pytest.raises(DotParseError):
+        parse_dot_stream(io.StringIO(text))
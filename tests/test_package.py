@@ -0,0 +1,59 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from app.bst import bst_build, save_snapshot
+from app.bst.__main__ import main
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_importing_the_engine_loads_no_ui_or_heavy_dependencies():
+    code = (
+        "import sys, app.bst; "
+        "print(sorted(m for m in ('streamlit', 'graphviz', 'numpy') if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_cli_build_search_and_traverse(tmp_path, capsys):
+    keys_file = tmp_path / "chaves.txt"
+    keys_file.write_text("50, 30 70\n20;40\n")
+    snapshot = tmp_path / "arvore.bst"
+
+    assert main(["build", str(keys_file), "-o", str(snapshot)]) == 0
+    assert main(["traverse", str(snapshot), "--order", "breadth_first"]) == 0
+    assert capsys.readouterr().out.split() == ["40", "30", "70", "20", "50"]
+
+    assert main(["search", str(keys_file), "40", "99", "--insertion-shape", "--path"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == ["40\tencontrada\t50 -> 30 -> 40", "99\tausente\t50 -> 70"]
+
+
+def test_cli_reports_invalid_input_without_traceback(tmp_path, capsys):
+    bad = tmp_path / "ruim.dot"
+    bad.write_text('"node5":esq -> "node9"\n')
+    assert main(["traverse", str(bad)]) == 1
+    assert "erro:" in capsys.readouterr().err
+
+
+def test_cli_reads_snapshots_written_by_the_engine(tmp_path, capsys):
+    path = tmp_path / "x.bst"
+    save_snapshot(bst_build(range(10)), str(path))
+    assert main(["traverse", str(path)]) == 0
+    assert capsys.readouterr().out.split() == [str(k) for k in range(10)]
+    assert main(["search", str(path), "3", "42", "--no-verify"]) == 0
+    assert [line.split("\t")[1] for line in capsys.readouterr().out.splitlines()] == ["encontrada", "ausente"]
+
+
+def test_cli_handles_keys_outside_int64(tmp_path, capsys):
+    keys_file = tmp_path / "grandes.txt"
+    keys_file.write_text("50 30 99999999999999999999\n")
+    assert main(["traverse", str(keys_file)]) == 0
+    assert capsys.readouterr().out.split() == ["30", "50", "99999999999999999999"]
+    assert main(["search", str(keys_file), "30", "99999999999999999999", "7"]) == 0
+    assert [line.split("\t")[1] for line in capsys.readouterr().out.splitlines()] == [
+        "encontrada", "encontrada", "ausente"]
+    assert main(["build", str(keys_file), "--workers", "2"]) == 1
+    assert "erro:" in capsys.readouterr().err
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+import app.bst.parallel as parallel
+from app.bst import (
+    ArrayTree,
+    EytzingerTree,
+    breadth_first_keys,
+    bst_build,
+    inorder_keys,
+    parallel_build,
+    parallel_search,
+    parallel_traversal,
+    postorder_keys,
+    preorder_keys,
+    search_many,
+)
+
+SEQUENTIAL = {
+    "preorder": preorder_keys,
+    "inorder": inorder_keys,
+    "postorder": postorder_keys,
+    "breadth_first": breadth_first_keys,
+}
+
+
+@pytest.fixture(autouse=True)
+def small_trees_in_parallel(monkeypatch):
+    # força o caminho paralelo mesmo em árvores pequenas
+    monkeypatch.setattr(parallel, "PARALLEL_MIN_NODES", 20)
+
+
+def columns(tree):
+    return [list(tree.keys), list(tree.left), list(tree.right), list(tree.sizes)]
+
+
+@pytest.mark.parametrize("n", [0, 1, 19, 20, 21, 333])
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_parallel_build_matches_the_sequential_layout(n, workers):
+    keys = random.Random(n).sample(range(5 * n + 1), n)
+    assert columns(parallel_build(keys + keys[:5], workers)) == columns(ArrayTree.from_root(bst_build(keys)))
+
+
+@pytest.mark.parametrize("n", [0, 1, 25, 400])
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_parallel_traversals_keep_the_sequential_order(n, workers):
+    root = bst_build(random.Random(n).sample(range(5 * n + 1), n), insertion_shape=True)
+    for view in (root, ArrayTree.from_root(root).root, EytzingerTree.from_root(root).root):
+        for order, traversal in SEQUENTIAL.items():
+            assert list(parallel_traversal(view, order, workers)) == list(traversal(view))
+
+
+def test_parallel_traversal_of_a_degenerate_tree():
+    root = bst_build(range(100), insertion_shape=True)
+    assert list(parallel_traversal(root, "breadth_first", 2)) == list(range(100))
+
+
+def test_unknown_traversal_is_rejected():
+    with pytest.raises(ValueError):
+        parallel_traversal(None, "levelorder")
+
+
+@pytest.mark.parametrize("n", [0, 1, 30, 500])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_search_matches_search_many(n, workers):
+    keys = random.Random(n).sample(range(5 * n + 1), n)
+    root = bst_build(keys, insertion_shape=True)
+    queries = [random.Random(i).randrange(-3, 5 * n + 4) for i in range(300)]
+    result = parallel_search(root, queries, workers)
+    expected = search_many(root, queries, with_depth=True)
+    assert list(result.found) == list(expected.found)
+    assert list(result.depths) == list(expected.depths)
+
+
+def test_parallel_search_with_keys_outside_int64():
+    keys = list(range(0, 100, 2)) + [2 ** 70]
+    root = bst_build(keys, insertion_shape=True)
+    queries = {4, 5, 2 ** 70, -2 ** 70}
+    result = parallel_search(root, queries, 2)
+    expected = search_many(root, queries, with_depth=True)
+    assert list(result.found) == list(expected.found) == [k in keys for k in queries]
+    assert list(result.depths) == list(expected.depths)
@@ -0,0 +1,96 @@
+import random
+from itertools import islice
+
+import pytest
+
+from app.bst import (
+    BALANCE_AVL,
+    bst_build,
+    ceiling,
+    count_range,
+    floor,
+    predecessor,
+    range_keys,
+    rank,
+    search_many,
+    search_node_ref,
+    select,
+    successor,
+)
+from reference import SortedKeys, naive_path, naive_shape
+
+KEYS = random.Random(5).sample(range(0, 2_000, 2), 300)      # só pares: ímpares são ausentes
+
+
+@pytest.fixture(params=["insertion", "balanced", "avl"])
+def root(request):
+    if request.param == "insertion":
+        return bst_build(KEYS, insertion_shape=True)
+    if request.param == "avl":
+        return bst_build(KEYS, BALANCE_AVL, insertion_shape=True)
+    return bst_build(KEYS)
+
+
+def test_search_records_the_visited_path():
+    root = bst_build(KEYS, insertion_shape=True)
+    reference = naive_shape(KEYS)
+    for key in range(-3, 2_003):
+        node, path = search_node_ref(root, key)
+        assert path == naive_path(reference, key)
+        assert (node is not None) == (key in set(KEYS))
+
+
+def test_search_many_matches_single_searches(root):
+    queries = list(range(-5, 2_005, 3))
+    batch = search_many(root, queries, with_depth=True, with_path=True)
+    for i, key in enumerate(queries):
+        node, path = search_node_ref(root, key)
+        assert bool(batch.found[i]) == (node is not None)
+        assert batch.depths[i] == (len(path) - 1 if node is not None else -1)
+        assert batch.paths[i] == path
+
+
+def test_search_many_on_an_empty_tree():
+    batch = search_many(None, [1, 2], with_depth=True)
+    assert not batch.found.any() and list(batch.depths) == [-1, -1]
+
+
+def test_search_many_accepts_sets_and_keys_outside_int64():
+    big = 2 ** 70
+    root = bst_build([50, 30, big, -big])
+    queries = {30, 31, big, -big, 2 ** 80}
+    batch = search_many(root, queries, with_depth=True)
+    for i, key in enumerate(queries):
+        node, path = search_node_ref(root, key)
+        assert bool(batch.found[i]) == (node is not None)
+        assert batch.depths[i] == (len(path) - 1 if node is not None else -1)
+    small = bst_build(KEYS)
+    assert list(search_many(small, [KEYS[0], big]).found) == [True, False]
+    assert list(search_many(small, (k for k in KEYS[:3])).found) == [True] * 3
+
+
+def test_order_statistics_match_a_sorted_list(root):
+    ref = SortedKeys(KEYS)
+    assert [select(root, k) for k in range(len(ref.keys))] == ref.keys
+    for key in range(-3, 2_003, 7):
+        assert rank(root, key) == ref.rank(key)
+        assert floor(root, key) == ref.floor(key)
+        assert ceiling(root, key) == ref.ceiling(key)
+        assert predecessor(root, key) == ref.predecessor(key)
+        assert successor(root, key) == ref.successor(key)
+        assert count_range(root, key, key + 100) == ref.count_range(key, key + 100)
+    assert count_range(root, 10, 5) == 0
+    with pytest.raises(IndexError):
+        select(root, len(ref.keys))
+
+
+def test_range_keys_both_directions(root):
+    ref = SortedKeys(KEYS)
+    rng = random.Random(1)
+    for _ in range(50):
+        lo = rng.choice([None, rng.randrange(-10, 2_010)])
+        hi = rng.choice([None, rng.randrange(-10, 2_010)])
+        expected = ref.range(lo, hi)
+        assert list(range_keys(root, lo, hi)) == expected
+        assert list(range_keys(root, lo, hi, reverse=True)) == expected[::-1]
+    assert list(islice(range_keys(root, lo=501), 3)) == ref.range(501, None)[:3]
@@ -0,0 +1,160 @@
+import io
+import random
+import struct
+
+import pytest
+
+from app.bst import (
+    ArrayTree,
+    EytzingerTree,
+    SnapshotError,
+    breadth_first_keys,
+    bst_build,
+    inorder_keys,
+    load_snapshot,
+    postorder_keys,
+    preorder_keys,
+    range_keys,
+    save_snapshot,
+    search_node_ref,
+    select,
+    snapshot_from_buffer,
+    write_snapshot,
+)
+from reference import SortedKeys, check_invariants, shape
+
+TRAVERSALS = [preorder_keys, inorder_keys, postorder_keys, breadth_first_keys]
+
+
+def sample_tree(n, seed=0):
+    return bst_build(random.Random(seed).sample(range(10 * n + 1), n), insertion_shape=True)
+
+
+def snapshot_bytes(root):
+    buffer = io.BytesIO()
+    write_snapshot(root, buffer)
+    return bytearray(buffer.getvalue())
+
+
+# ----- ArrayTree e snapshot -----------------------------------------------------
+@pytest.mark.parametrize("n", [0, 1, 2, 60, 500])
+def test_array_tree_behaves_like_the_node_tree(n):
+    root = sample_tree(n, seed=n)
+    tree = ArrayTree.from_root(root)
+    assert len(tree) == n
+    assert shape(tree.root) == shape(root)
+    for traversal in TRAVERSALS:
+        assert list(traversal(tree.root)) == list(traversal(root))
+    back = tree.to_nodes()
+    assert shape(back) == shape(root)
+    check_invariants(back)
+
+
+@pytest.mark.parametrize("n", [0, 1, 300])
+def test_snapshot_round_trip_through_bytes_and_mmap(n, tmp_path):
+    root = sample_tree(n, seed=n)
+    assert shape(snapshot_from_buffer(bytes(snapshot_bytes(root))).root) == shape(root)
+    if n:
+        path = tmp_path / "arvore.bst"
+        save_snapshot(root, str(path))
+        loaded = load_snapshot(str(path))
+        assert shape(loaded.root) == shape(root)
+        assert search_node_ref(loaded.root, root.key)[0].key == root.key
+
+
+def _column_offset(count, column):
+    # cabeçalho de 32 bytes, depois keys int64, left, right e sizes int32
+    return 32 + count * 8 + column * count * 4
+
+
+@pytest.mark.parametrize("column, index, value, message", [
+    (0, 1, 0, "esquerdo"),          # left[1] = 0: laço de volta para a raiz
+    (0, 1, 99, "esquerdo"),         # além do fim
+    (1, 0, 0, "direito"),           # raiz apontando para si mesma
+    (2, 6, 7, "tamanho"),           # sizes de uma folha inconsistente
+    (2, 0, 2, "raiz"),
+])
+def test_corrupt_snapshot_columns_are_rejected(column, index, value, message):
+    root = bst_build([4, 2, 6, 1, 3, 5, 7])               # 7 nós, completa
+    data = snapshot_bytes(root)
+    offset = _column_offset(7, column) + 4 * index
+    data[offset: offset + 4] = struct.pack("<i", value)
+    with pytest.raises(SnapshotError, match=message):
+        snapshot_from_buffer(bytes(data))
+
+
+def test_verification_can_be_skipped_for_trusted_snapshots(tmp_path):
+    data = snapshot_bytes(bst_build([2, 1, 3]))
+    offset = _column_offset(3, 2)
+    data[offset: offset + 4] = struct.pack("<i", 4)       # só sizes[0] errado
+    with pytest.raises(SnapshotError, match="raiz"):
+        snapshot_from_buffer(bytes(data))
+    assert len(snapshot_from_buffer(bytes(data), verify=False)) == 3
+    path = tmp_path / "arvore.bst"
+    path.write_bytes(data)
+    with pytest.raises(SnapshotError):
+        load_snapshot(str(path))
+    assert load_snapshot(str(path), verify=False).keys[0] == 2
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"", "curto"),
+    (b"XXXXXXXX" + bytes(24), "assinatura"),
+])
+def test_snapshot_header_errors(data, message):
+    with pytest.raises(SnapshotError, match=message):
+        snapshot_from_buffer(data)
+
+
+def test_truncated_snapshot_is_rejected():
+    data = snapshot_bytes(sample_tree(10))
+    with pytest.raises(SnapshotError, match="tamanho"):
+        snapshot_from_buffer(bytes(data[:-1]))
+
+
+def test_snapshot_of_keys_outside_int64_raises_snapshot_error():
+    with pytest.raises(SnapshotError, match="int64"):
+        write_snapshot(bst_build([1, 2 ** 70]), io.BytesIO())
+
+
+# ----- Layout de Eytzinger ------------------------------------------------------
+@pytest.mark.parametrize("n", list(range(0, 34)) + [100, 1000])
+def test_eytzinger_queries_match_a_sorted_list(n):
+    keys = random.Random(n).sample(range(0, 20 * n + 2, 2), n)
+    tree = EytzingerTree.from_root(sample_tree(0) if not n else bst_build(keys, insertion_shape=True))
+    ref = SortedKeys(keys)
+    assert len(tree) == n
+    assert list(breadth_first_keys(tree.root)) == list(tree.keys[1:])
+    assert list(inorder_keys(tree.root)) == ref.keys
+    for key in range(-3, 20 * n + 5):
+        index = tree.lower_bound(key)
+        assert (tree.keys[index] if index else None) == ref.ceiling(key)
+    assert [tree.keys[i] for i in _walk(tree)] == ref.keys
+    queries = list(range(-3, 20 * n + 5))
+    assert list(tree.contains_many(queries)) == [k in set(keys) for k in queries]
+    for lo in range(-3, 20 * n + 5, 5):
+        assert list(tree.range_keys(lo, lo + 17)) == ref.range(lo, lo + 17)
+
+
+def _walk(tree):
+    i = tree.lower_bound(-10 ** 18)
+    while i:
+        yield i
+        i = tree.next_index(i)
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 31, 32, 200])
+def test_eytzinger_views_support_the_node_apis(n):
+    tree = EytzingerTree.from_root(sample_tree(n, seed=n))
+    nodes = tree.to_nodes()
+    check_invariants(nodes, avl=True)                     # árvore completa
+    assert shape(tree.root) == shape(nodes)
+    for traversal in TRAVERSALS:
+        assert list(traversal(tree.root)) == list(traversal(nodes))
+    for key in range(-2, 10 * n + 3):
+        found, path = search_node_ref(tree.root, key)
+        expected, expected_path = search_node_ref(nodes, key)
+        assert path == expected_path
+        assert (found is None) == (expected is None)
+    assert [select(tree.root, k) for k in range(n)] == list(inorder_keys(nodes))
+    assert list(range_keys(tree.root, 3, 40)) == list(range_keys(nodes, 3, 40))
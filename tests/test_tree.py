@@ -0,0 +1,125 @@
+import random
+
+import pytest
+
+from app.bst import (
+    BALANCE_AVL,
+    BALANCE_NONE,
+    bst_build,
+    bst_delete,
+    bst_insert,
+    inorder_keys,
+    postorder_keys,
+    preorder_keys,
+)
+from reference import check_invariants, naive_shape, shape
+
+
+def insert_all(keys, balance=BALANCE_NONE):
+    root = None
+    for key in keys:
+        root = bst_insert(root, key, balance)
+    return root
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_plain_insert_matches_naive_shape(seed):
+    rng = random.Random(seed)
+    keys = [rng.randrange(200) for _ in range(150)]      # com repetidas
+    root = insert_all(keys)
+    assert shape(root) == naive_shape(keys)
+    check_invariants(root)
+
+
+@pytest.mark.parametrize("keys", [
+    list(range(300)),
+    list(range(300, 0, -1)),
+    [i if i % 2 else 300 - i for i in range(300)],
+    random.Random(7).sample(range(10_000), 500),
+])
+def test_avl_insert_keeps_order_and_balance(keys):
+    root = insert_all(keys, BALANCE_AVL)
+    check_invariants(root, avl=True)
+    assert list(inorder_keys(root)) == sorted(set(keys))
+
+
+@pytest.mark.parametrize("balance", [BALANCE_NONE, BALANCE_AVL])
+def test_delete_against_a_python_set(balance):
+    rng = random.Random(11)
+    root, present = None, set()
+    for _ in range(2_000):
+        key = rng.randrange(150)
+        if rng.random() < 0.55:
+            root = bst_insert(root, key, balance)
+            present.add(key)
+        else:
+            root = bst_delete(root, key, balance)
+            present.discard(key)
+        check_invariants(root, avl=balance == BALANCE_AVL)
+        assert list(inorder_keys(root)) == sorted(present)
+
+
+def test_sorted_inserts_and_traversals_do_not_recurse():
+    keys = range(3_000)
+    root = insert_all(keys)                              # lista ligada à direita
+    assert root.height == 3_000
+    assert list(inorder_keys(root)) == list(keys)
+    assert list(preorder_keys(root)) == list(keys)
+    assert list(postorder_keys(root)) == list(keys)[::-1]
+    root = bst_delete(root, 0)
+    assert root.key == 1 and root.height == 2_999
+
+
+@pytest.mark.parametrize("balance", [BALANCE_NONE, BALANCE_AVL])
+def test_persistent_edits_leave_previous_versions_untouched(balance):
+    rng = random.Random(3)
+    versions = [insert_all(rng.sample(range(500), 100), balance)]
+    snapshots = [shape(versions[0])]
+    for _ in range(200):
+        key = rng.randrange(500)
+        if rng.random() < 0.5:
+            new = bst_insert(versions[-1], key, balance, persistent=True)
+        else:
+            new = bst_delete(versions[-1], key, balance, persistent=True)
+        check_invariants(new, avl=balance == BALANCE_AVL)
+        versions.append(new)
+        snapshots.append(shape(new))
+    # nenhuma versão antiga mudou depois das edições seguintes
+    assert [shape(v) for v in versions] == snapshots
+
+
+def test_persistent_insert_copies_only_the_path():
+    root = bst_build(range(1, 128))                      # perfeitamente balanceada
+    new = bst_insert(root, 1000, persistent=True)
+    assert new is not root
+    assert new.left is root.left                         # subárvore fora do caminho é compartilhada
+    assert list(inorder_keys(root)) == list(range(1, 128))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_build_with_insertion_shape_matches_sequential_inserts(seed):
+    rng = random.Random(seed)
+    keys = [rng.randrange(300) for _ in range(200)]
+    root = bst_build(keys, insertion_shape=True)
+    assert shape(root) == naive_shape(keys)
+    check_invariants(root)
+    avl = bst_build(keys, BALANCE_AVL, insertion_shape=True)
+    assert shape(avl) == shape(insert_all(keys, BALANCE_AVL))
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 7, 8, 100, 1023])
+def test_balanced_build_has_minimal_height(n):
+    keys = random.Random(n).sample(range(10 * n + 1), n)
+    root = bst_build(keys + keys[: n // 2])
+    assert list(inorder_keys(root)) == sorted(keys)
+    if n:
+        check_invariants(root, avl=True)
+        assert root.height == n.bit_length()
+    else:
+        assert root is None
+
+
+def test_build_deep_sorted_insertion_shape_without_recursion():
+    root = bst_build(range(50_000), insertion_shape=True)   # lista ligada à direita
+    assert root.height == 50_000
+    assert next(iter(preorder_keys(root))) == 0